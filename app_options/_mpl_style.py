@@ -0,0 +1,7 @@
+# Merge line segments into one path when rendering; applied per figure through
+# matplotlib.rc_context so the global rcParams are left untouched
+MPL_RC_PARAMS = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10_000,
+}
@@ -1,9 +1,11 @@
+import io
 import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
 from typing import Tuple, Union
 
-st.set_page_config(layout="wide")
+# Page config is sticky for the session, so only send it on the first run
+if "_page_config_binomial_model" not in st.session_state:
+    st.set_page_config(layout="wide")
+    st.session_state["_page_config_binomial_model"] = True
 st.markdown("### The Binomial Model for Option Pricing")
 
 
@@ -18,17 +20,13 @@ st.info(
 )
 
 
-st.write(
+st.markdown(
     "The Binomial Model is a **discrete-time model** for pricing options (as opposed to continuous time). "
-    "It uses a **binomial tree** to represent the possible paths that the underlying asset price can take over time."
-)
-st.write(
+    "It uses a **binomial tree** to represent the possible paths that the underlying asset price can take over time.\n\n"
     "The model assumes that the price of the underlying asset can move up or down by a certain factor in each time step, "
     "and it calculates the option price based on these possible future prices. \n"
     "- Up by a factor of **u** \n"
-    "- Down by a factor of **d**"
-)
-st.write(
+    "- Down by a factor of **d**\n\n"
     "The Binomial Model: \n"
     "- Is particularly useful for pricing American options, which can be exercised at any time before expiration. \n"
     "- Is based on the principle of risk-neutral valuation, "
@@ -37,50 +35,58 @@ st.write(
 )
 
 
-def draw_one_step_binomial_tree(
+@st.cache_data(max_entries=16, show_spinner=False)
+def one_step_binomial_tree_png(
     root_node: Tuple[Union[str, int], Union[str, int, float]],
     up_node: Tuple[Union[str, int], Union[str, int, float]],
     down_node: Tuple[Union[str, int], Union[str, int, float]],
     plot_title: str,
-) -> None:
-    root_node_label, root_node_value = root_node
-    up_node_label, up_node_value = up_node
-    down_node_label, down_node_value = down_node
-
-    # Create the binomial tree graph
-    G = nx.DiGraph()
-    G.add_node(root_node_label, value=root_node_value)
-    G.add_node(up_node_label, value=up_node_value)
-    G.add_node(down_node_label, value=down_node_value)
-    G.add_edge(root_node_label, up_node_label, move="Up")
-    G.add_edge(root_node_label, down_node_label, move="Down")
-
-    # Draw the graph
-    pos = {root_node_label: (0, 0), up_node_label: (1, 1), down_node_label: (1, -1)}
-
-    labels = nx.get_node_attributes(G, "value")
-    edge_labels = nx.get_edge_attributes(G, "move")
-
-    fig, ax = plt.subplots(figsize=(6, 4))
-    nx.draw(
-        G,
-        pos,
-        with_labels=False,
-        node_color="lightblue",
-        node_size=1_600,
-        font_size=30,
-        ax=ax,
-    )
-    nx.draw_networkx_labels(
-        G, pos, labels={k: f"{k}\n{v}" for k, v in labels.items()}, font_size=7, ax=ax
-    )
-    nx.draw_networkx_edge_labels(
-        G, pos, edge_labels=edge_labels, font_color="red", font_size=10, ax=ax
-    )
-
-    plt.title(plot_title)
-    st.pyplot(fig)
-    plt.close(fig)
+) -> bytes:
+    from matplotlib.figure import Figure
+
+    # Fixed layout for the three nodes of a one-step tree
+    nodes = [(root_node, (0, 0)), (up_node, (1, 1)), (down_node, (1, -1))]
+
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+    ax.set_xlim(-0.3, 1.3)
+    ax.set_ylim(-1.4, 1.4)
+    ax.axis("off")
+
+    # Draw the Up and Down moves as arrows from the root node
+    for (_, (x, y)), move in zip(nodes[1:], ["Up", "Down"]):
+        ax.annotate(
+            "",
+            xy=(x, y),
+            xytext=(0, 0),
+            arrowprops={
+                "arrowstyle": "-|>",
+                "color": "black",
+                "shrinkA": 21,
+                "shrinkB": 21,
+            },
+        )
+        ax.text(
+            x / 2,
+            y / 2,
+            move,
+            color="red",
+            fontsize=10,
+            ha="center",
+            va="center",
+            bbox={"boxstyle": "round", "ec": "white", "fc": "white"},
+        )
+
+    for (label, value), (x, y) in nodes:
+        ax.scatter(x, y, s=1_600, color="lightblue", zorder=2)
+        ax.text(x, y, f"{label}\n{value}", fontsize=7, ha="center", va="center")
+
+    ax.set_title(plot_title)
+
+    buffer = io.BytesIO()
+    # Match the st.pyplot defaults so the chart looks the same as before
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    return buffer.getvalue()
 
 
 st.markdown("### Worked Example on a European Call Option")
@@ -92,30 +98,12 @@ st.write(
 )
 
 
-col1, col2 = st.columns(2)
-
-with col1:
-    price_initial = 100
-    price_strike = 100
-    price_up = st.number_input(
-        "Up Price",
-        min_value=101,
-        max_value=110,
-        value=101,
-        step=1,
-        help="The price of the underlying asset after an upward movement.",
-    )
-    price_down = st.number_input(
-        "Down Price",
-        min_value=90,
-        max_value=99,
-        value=99,
-        step=1,
-        help="The price of the underlying asset after a downward movement.",
-    )
-
-with col2:
-    latex_code = rf"""
+@st.cache_data
+def latex_parameters(
+    price_initial: int, price_up: int, price_down: int, price_strike: int
+) -> str:
+    """LaTeX block listing the one-step tree parameters."""
+    return rf"""
     \begin{{align*}}
         u &= \frac{{{price_up}}}{{{price_initial}}} \\
         ~ \\
@@ -130,60 +118,14 @@ with col2:
         K &= {price_strike} \\
     \end{{align*}}
     """
-    st.latex(latex_code)
-
-
-payoff_up = max(price_up - price_strike, 0)
-payoff_down = max(price_down - price_strike, 0)
 
-col1, col2 = st.columns(2)
 
-with col1:
-    st.markdown("##### Stock:")
-    draw_one_step_binomial_tree(
-        ("Initial Price", price_initial),
-        ("Up", price_up),
-        ("Down", price_down),
-        "Stock Price Movement",
-    )
-
-with col2:
-    st.markdown("##### Option:")
-    draw_one_step_binomial_tree(
-        (price_initial, ""),
-        (price_up, f"Payoff: {payoff_up}"),
-        (price_down, f"Payoff: {payoff_down}"),
-        f"Call Option with Strike Price {price_strike}",
-    )
-
-st.write(
-    f"If the stock price moves up to **{price_up}**, the value of the portfolio consisting of the **Option payoff** \
-         and the **Short Stock Position** is:"
-)
-latex_code = rf"""{payoff_up} - \Delta * {price_up}"""
-st.latex(latex_code)
-st.write(
-    "With $$\\Delta$$ being the number of shares of the underlying stock to Short."
-)
-st.write(
-    f"If the stock price moves down to **{price_down}**, the value of the portfolio is:"
-)
-latex_code = rf"""{payoff_down} - \Delta * {price_down}"""
-st.latex(latex_code)
-
-
-st.markdown("### Delta Neutral Hedging")
-
-st.write(
-    "In order to hedge the option, we need to create a portfolio that is delta neutral. "
-    "This means that the portfolio's value does not change whether the Underlying Stock Price goes up or down. "
-    "In order to do this we need to sell a certain number of shares of the underlying stock. "
-)
-st.write(
-    "To determine $$\\Delta$$, the amount of the stock to Short, "
-    "we equate the value of the portfolio after an upward movement to the value of the portfolio after a downward movement. "
-)
-latex_code = rf"""
+@st.cache_data
+def latex_delta_hedge(
+    price_up: int, price_down: int, payoff_up: int, payoff_down: int
+) -> str:
+    """LaTeX derivation of the hedge ratio that makes the portfolio delta neutral."""
+    return rf"""
 \begin{{align*}}
     {payoff_up} - \Delta * {price_up} &= {payoff_down} - \Delta * {price_down} \\
     ~ \\
@@ -196,7 +138,95 @@ latex_code = rf"""
     \Delta &= \frac{{{payoff_up - payoff_down}}}{{{price_up - price_down}}} \\
 \end{{align*}}
 """
-st.latex(latex_code)
+
+
+@st.fragment
+def worked_example() -> None:
+    """Render the inputs and every output that depends on the up and down prices."""
+    col1, col2 = st.columns(2)
+
+    with col1:
+        price_initial = 100
+        price_strike = 100
+        price_up = st.number_input(
+            "Up Price",
+            min_value=101,
+            max_value=110,
+            value=101,
+            step=1,
+            help="The price of the underlying asset after an upward movement.",
+        )
+        price_down = st.number_input(
+            "Down Price",
+            min_value=90,
+            max_value=99,
+            value=99,
+            step=1,
+            help="The price of the underlying asset after a downward movement.",
+        )
+
+    with col2:
+        st.latex(latex_parameters(price_initial, price_up, price_down, price_strike))
+
+    payoff_up = max(price_up - price_strike, 0)
+    payoff_down = max(price_down - price_strike, 0)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("##### Stock:")
+        st.image(
+            one_step_binomial_tree_png(
+                ("Initial Price", price_initial),
+                ("Up", price_up),
+                ("Down", price_down),
+                "Stock Price Movement",
+            ),
+            width="stretch",
+        )
+
+    with col2:
+        st.markdown("##### Option:")
+        st.image(
+            one_step_binomial_tree_png(
+                (price_initial, ""),
+                (price_up, f"Payoff: {payoff_up}"),
+                (price_down, f"Payoff: {payoff_down}"),
+                f"Call Option with Strike Price {price_strike}",
+            ),
+            width="stretch",
+        )
+
+    st.write(
+        f"If the stock price moves up to **{price_up}**, the value of the portfolio consisting of the **Option payoff** \
+             and the **Short Stock Position** is:"
+    )
+    latex_code = rf"""{payoff_up} - \Delta * {price_up}"""
+    st.latex(latex_code)
+    st.write(
+        "With $$\\Delta$$ being the number of shares of the underlying stock to Short."
+    )
+    st.write(
+        f"If the stock price moves down to **{price_down}**, the value of the portfolio is:"
+    )
+    latex_code = rf"""{payoff_down} - \Delta * {price_down}"""
+    st.latex(latex_code)
+
+    st.markdown("### Delta Neutral Hedging")
+
+    st.write(
+        "In order to hedge the option, we need to create a portfolio that is delta neutral. "
+        "This means that the portfolio's value does not change whether the Underlying Stock Price goes up or down. "
+        "In order to do this we need to sell a certain number of shares of the underlying stock. "
+    )
+    st.write(
+        "To determine $$\\Delta$$, the amount of the stock to Short, "
+        "we equate the value of the portfolio after an upward movement to the value of the portfolio after a downward movement. "
+    )
+    st.latex(latex_delta_hedge(price_up, price_down, payoff_up, payoff_down))
+
+
+worked_example()
 
 st.info("""
 - We do not care about whether the stock price goes up or down, as long as we have the right amount of shares to short.
@@ -212,26 +242,16 @@ and the underlying asset.""")
 
 
 with st.expander("Binomial Model Assumptions"):
-    st.write(
-        "1. The underlying asset price can move up or down to one of two possible prices in each time step."
-    )
-    st.write("2. Fractional trading is permitted.")
-    st.write("3. The risk-free rate is constant over the life of the option.")
-    st.write(
-        "4. The option can be exercised at any time before expiration (for American options)."
-    )
-    st.write(
-        "5. The model assumes that the option price is calculated at specific discrete time intervals."
-    )
-    st.write(
+    st.markdown(
+        "1. The underlying asset price can move up or down to one of two possible prices in each time step.\n"
+        "2. Fractional trading is permitted.\n"
+        "3. The risk-free rate is constant over the life of the option.\n"
+        "4. The option can be exercised at any time before expiration (for American options).\n"
+        "5. The model assumes that the option price is calculated at specific discrete time intervals.\n"
         "6. The model assumes that the underlying asset price follows a random walk, "
-        "which means that the future price is uncertain and can move in any direction."
-    )
-    st.write(
+        "which means that the future price is uncertain and can move in any direction.\n"
         "7. The model assumes that the underlying asset price follows a lognormal distribution, "
-        "which means that the logarithm of the price follows a normal distribution."
-    )
-    st.write(
+        "which means that the logarithm of the price follows a normal distribution.\n"
         "8. The model assumes that the option price is a function of the underlying asset price, "
         "the strike price, the time to expiration, and the risk-free rate."
     )
@@ -1,137 +1,217 @@
+import io
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 
 st.set_page_config(layout="wide")
 st.markdown("### Option Payoffs")
 
-option_position_type = st.selectbox(
-    "Select Option Position Type",
-    ["Long Call", "Short Call", "Long Put", "Short Put"],
-    index=0,
-    help="Select the type of option position to visualise the payoff.",
-)
-
-
-strike_price = st.number_input(
-    "Strike Price",
-    min_value=0.0,
-    value=100.0,
-    step=1.0,
-    help="Enter the strike price of the option.",
-)
-
-premium = st.number_input(
-    "Option Premium",
-    min_value=0.0,
-    value=10.0,
-    step=0.5,
-    help="Enter the premium paid/received for the option.",
-)
-
-# Generate stock price range for the payoff diagram
-price_range = strike_price * 0.5
-stock_prices = np.linspace(
-    max(0, strike_price - price_range), strike_price + price_range, 200
-)
-
-# Calculate payoff based on position type
-if option_position_type == "Long Call":
-    payoff = np.maximum(stock_prices - strike_price, 0) - premium
-    break_even = strike_price + premium
-elif option_position_type == "Short Call":
-    payoff = premium - np.maximum(stock_prices - strike_price, 0)
-    break_even = strike_price + premium
-elif option_position_type == "Long Put":
-    payoff = np.maximum(strike_price - stock_prices, 0) - premium
-    break_even = strike_price - premium
-else:  # Short Put
-    payoff = premium - np.maximum(strike_price - stock_prices, 0)
-    break_even = strike_price - premium
-
-# Create the matplotlib figure
-fig, ax = plt.subplots(figsize=(10, 6))
-
-# Plot the payoff line
-ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Profit/Loss")
-
-# Add zero line
-ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-
-# Add strike price vertical line
-ax.axvline(
-    x=strike_price,
-    color="red",
-    linestyle="--",
-    linewidth=1,
-    label=f"Strike: £{strike_price:.2f}",
-)
-
-# Add break-even vertical line
-if break_even > 0:
+# (long/short sign, call/put sign) for each option position
+PAYOFF_TABLE = {
+    "Long Call": (1, 1),
+    "Short Call": (-1, 1),
+    "Long Put": (1, -1),
+    "Short Put": (-1, -1),
+}
+
+# (payoff formula, max loss, max profit) for each option position, with the
+# max loss/profit text built from (strike_price, premium)
+PAYOFF_META = {
+    "Long Call": (
+        r"\text{Payoff} = \max(S_T - K, 0) - \text{Premium}",
+        lambda K, p: "Premium paid (limited)",
+        lambda K, p: "Unlimited",
+    ),
+    "Short Call": (
+        r"\text{Payoff} = \text{Premium} - \max(S_T - K, 0)",
+        lambda K, p: "Unlimited",
+        lambda K, p: "Premium received (limited)",
+    ),
+    "Long Put": (
+        r"\text{Payoff} = \max(K - S_T, 0) - \text{Premium}",
+        lambda K, p: "Premium paid (limited)",
+        lambda K, p: f"£{K - p:.2f} (if stock goes to £0)",
+    ),
+    "Short Put": (
+        r"\text{Payoff} = \text{Premium} - \max(K - S_T, 0)",
+        lambda K, p: f"£{K - p:.2f} (if stock goes to £0)",
+        lambda K, p: "Premium received (limited)",
+    ),
+}
+
+
+@st.cache_data
+def compute_payoff(
+    position_type: str, strike_price: float, premium: float
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """Return the stock price grid, payoff and break-even for an option position."""
+    # Generate stock price range for the payoff diagram. The payoff is piecewise
+    # linear, so an odd sample count that lands exactly on the strike is enough.
+    stock_prices = np.linspace(
+        0.5 * strike_price, 1.5 * strike_price, 65, dtype=np.float32
+    )
+
+    # Calculate payoff as long_short * (max(call_put * (S - K), 0) - premium),
+    # writing every step into one buffer
+    long_short, call_put = PAYOFF_TABLE[position_type]
+    payoff = np.empty_like(stock_prices)
+    np.subtract(stock_prices, strike_price, out=payoff)
+    payoff *= call_put
+    np.clip(payoff, 0, None, out=payoff)
+    payoff -= premium
+    payoff *= long_short
+    break_even = strike_price + call_put * premium
+
+    return stock_prices, payoff, break_even
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def payoff_chart_png(position_type: str, strike_price: float, premium: float) -> bytes:
+    """Payoff diagram as PNG bytes, cached so repeated inputs skip re-rendering."""
+    from matplotlib.figure import Figure
+
+    stock_prices, payoff, break_even = compute_payoff(
+        position_type, strike_price, premium
+    )
+
+    # Create the figure outside the pyplot registry so it is freed once rendered
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+
+    # Plot the payoff line
+    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Profit/Loss")
+
+    # Add zero line
+    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
+
+    # Add strike price vertical line
     ax.axvline(
-        x=break_even,
-        color="green",
+        x=strike_price,
+        color="red",
         linestyle="--",
         linewidth=1,
-        label=f"Break-even: £{break_even:.2f}",
+        label=f"Strike: £{strike_price:.2f}",
     )
 
-# Fill profit/loss regions
-ax.fill_between(
-    stock_prices,
-    payoff,
-    0,
-    where=(payoff > 0),
-    alpha=0.3,
-    color="green",
-    label="Profit",
-)
-ax.fill_between(
-    stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red", label="Loss"
-)
-
-# Labels and title
-ax.set_xlabel("Stock Price at Expiration (£)", fontsize=12)
-ax.set_ylabel("Profit/Loss (£)", fontsize=12)
-ax.set_title(f"{option_position_type} Payoff Diagram", fontsize=14, fontweight="bold")
-ax.legend(loc="best")
-ax.grid(True, alpha=0.3)
-
-# Create two columns: chart on left, text on right
-col_chart, col_text = st.columns([3, 2])
-
-with col_chart:
-    st.pyplot(fig)
-
-with col_text:
-    st.markdown("#### Payoff Formulas")
-
-    if option_position_type == "Long Call":
-        st.latex(r"\text{Payoff} = \max(S_T - K, 0) - \text{Premium}")
-        st.markdown("**Max Loss:** Premium paid (limited)")
-        st.markdown("**Max Profit:** Unlimited")
-    elif option_position_type == "Short Call":
-        st.latex(r"\text{Payoff} = \text{Premium} - \max(S_T - K, 0)")
-        st.markdown("**Max Loss:** Unlimited")
-        st.markdown("**Max Profit:** Premium received (limited)")
-    elif option_position_type == "Long Put":
-        st.latex(r"\text{Payoff} = \max(K - S_T, 0) - \text{Premium}")
-        st.markdown("**Max Loss:** Premium paid (limited)")
-        st.markdown(
-            f"**Max Profit:** £{strike_price - premium:.2f} (if stock goes to £0)"
-        )
-    else:  # Short Put
-        st.latex(r"\text{Payoff} = \text{Premium} - \max(K - S_T, 0)")
-        st.markdown(
-            f"**Max Loss:** £{strike_price - premium:.2f} (if stock goes to £0)"
+    # Add break-even vertical line
+    if break_even > 0:
+        ax.axvline(
+            x=break_even,
+            color="green",
+            linestyle="--",
+            linewidth=1,
+            label=f"Break-even: £{break_even:.2f}",
         )
-        st.markdown("**Max Profit:** Premium received (limited)")
 
-    st.markdown(f"""
+    # Fill profit/loss regions from a single mask pass over the payoff
+    profit_mask = payoff > 0
+    ax.fill_between(
+        stock_prices,
+        payoff,
+        0,
+        where=profit_mask,
+        interpolate=True,
+        alpha=0.3,
+        color="green",
+        label="Profit",
+    )
+    ax.fill_between(
+        stock_prices,
+        payoff,
+        0,
+        where=~profit_mask,
+        interpolate=True,
+        alpha=0.3,
+        color="red",
+        label="Loss",
+    )
+
+    # Labels and title
+    ax.set_xlabel("Stock Price at Expiration (£)", fontsize=12)
+    ax.set_ylabel("Profit/Loss (£)", fontsize=12)
+    ax.set_title(f"{position_type} Payoff Diagram", fontsize=14, fontweight="bold")
+    # Long calls and short puts rise to the right, leaving the upper left clear;
+    # short calls and long puts mirror this
+    long_short, call_put = PAYOFF_TABLE[position_type]
+    ax.legend(loc="upper left" if long_short * call_put > 0 else "upper right")
+    ax.grid(True, alpha=0.3)
+
+    buffer = io.BytesIO()
+    # Match the st.pyplot defaults so the chart looks the same as before
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    return buffer.getvalue()
+
+
+@st.cache_data
+def payoff_summary_markdown(
+    position_type: str, strike_price: float, premium: float, break_even: float
+) -> str:
+    """Markdown for the payoff formula, max loss/profit and inputs of a position."""
+    formula, max_loss_fn, max_profit_fn = PAYOFF_META[position_type]
+    max_loss = max_loss_fn(strike_price, premium)
+    max_profit = max_profit_fn(strike_price, premium)
+
+    return f"""
+#### Payoff Formulas
+
+$$
+{formula}
+$$
+
+**Max Loss:** {max_loss}
+
+**Max Profit:** {max_profit}
+
 Where:
 - $S_T$ = Stock price at expiration
 - $K$ = Strike price (£{strike_price:.2f})
 - Premium = £{premium:.2f}
 - Break-even = £{break_even:.2f}
-""")
+"""
+
+
+@st.fragment
+def payoff_chart() -> None:
+    """Render the inputs, payoff chart and formulas, rerunning only this block."""
+    option_position_type = st.selectbox(
+        "Select Option Position Type",
+        list(PAYOFF_TABLE),
+        index=0,
+        help="Select the type of option position to visualise the payoff.",
+    )
+
+    strike_price = st.number_input(
+        "Strike Price",
+        min_value=0.0,
+        value=100.0,
+        step=1.0,
+        help="Enter the strike price of the option.",
+    )
+
+    premium = st.number_input(
+        "Option Premium",
+        min_value=0.0,
+        value=10.0,
+        step=0.5,
+        help="Enter the premium paid/received for the option.",
+    )
+
+    break_even = compute_payoff(option_position_type, strike_price, premium)[2]
+
+    # Create two columns: chart on left, text on right
+    col_chart, col_text = st.columns([3, 2])
+
+    with col_chart:
+        st.image(
+            payoff_chart_png(option_position_type, strike_price, premium),
+            width="stretch",
+        )
+
+    with col_text:
+        st.markdown(
+            payoff_summary_markdown(
+                option_position_type, strike_price, premium, break_even
+            )
+        )
+
+
+payoff_chart()
@@ -1,7 +1,12 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import norm
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import altair as alt
+    import pandas as pd
 
 st.set_page_config(layout="wide")
 st.markdown("### Put-Call Parity")
@@ -26,34 +31,138 @@ st.info(
 # ---------------------------------------------------------------------------
 
 
-def black_scholes_call(S, K, T, r, sigma):
-    """European call price via Black-Scholes."""
-    if T <= 0:
-        return np.maximum(S - K, 0.0)
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+def quantise(*values, ndigits=6):
+    """Round slider values so equal settings always produce identical cache keys."""
+    return tuple(round(float(value), ndigits) for value in values)
+
+
+@lru_cache(maxsize=256)
+def discount_factor(r, T):
+    """Continuously compounded discount factor e^{-rT}, shared across sections."""
+    return math.exp(-r * T)
+
 
+def black_scholes_call_put(S, K, T, r, sigma):
+    """European call and put prices via Black-Scholes.
 
-def black_scholes_put(S, K, T, r, sigma):
-    """European put price via Black-Scholes."""
+    d1, d2 and the discount factor are evaluated once and the put is derived
+    from the call by put-call parity, P = C - S + K e^{-rT}.
+    """
     if T <= 0:
-        return np.maximum(K - S, 0.0)
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    return K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+        call = np.maximum(S - K, 0.0)
+        return call, call - S + K
+    from scipy.special import ndtr
+
+    sqrt_T = math.sqrt(T)
+    discount = discount_factor(r, T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    call = S * ndtr(d1) - K * discount * ndtr(d2)
+    put = call - S + K * discount
+    return call, put
+
+
+def parity_scalars(K, T, r, C, P, S):
+    """Put-call parity quantities for scalar market inputs.
+
+    Returns (PV(K), C + PV(K), P + S, difference, implied call, implied put).
+    Uses the math module so no NumPy dispatch is paid on scalar inputs.
+    """
+    PV_K = K * discount_factor(r, T)
+    left_side = C + PV_K  # Portfolio A value
+    right_side = P + S  # Portfolio B value
+    return (
+        PV_K,
+        left_side,
+        right_side,
+        left_side - right_side,
+        P + S - PV_K,
+        C + PV_K - S,
+    )
 
 
-# ---------------------------------------------------------------------------
-# Section 1 – The Formula
-# ---------------------------------------------------------------------------
+@st.cache_data(max_entries=256)
+def arbitrage_strategy_markdown(sign, call, put, stock, pv_strike, profit):
+    """Arbitrage strategy steps for a parity violation in the direction of sign."""
+    return ARB_STRATEGY[sign].format(
+        call=call, put=put, stock=stock, pv_strike=pv_strike, profit=profit
+    )
 
-st.markdown("#### The Put-Call Parity Relationship")
 
-st.write("The parity condition can be expressed in two equivalent forms:")
+# The price grids depend only on scalar inputs and are deterministic, so they are
+# persisted to disk and shared across sessions and restarts
+@st.cache_data(max_entries=128, persist="disk", show_spinner=False)
+def compute_expiration_grid(K, n=129):
+    """Stock price grid and the common portfolio value max(S_T, K) at expiration."""
+    s_T = np.linspace(max(0, K - 50), K + 50, n)
+    # Call + bond and put + stock both pay max(S_T, K), so one pass covers both
+    portfolio_value = np.maximum(s_T, K)
+    return s_T, portfolio_value
 
-with st.expander(label="Put-Call Parity Formula", expanded=True):
-    latex_parity = r"""
+
+@st.cache_data(max_entries=128, persist="disk", show_spinner=False)
+def compute_pre_expiration_grid(K, T, r, sigma, n=129):
+    """Black-Scholes call and put values on a stock price grid around K."""
+    S_range = np.linspace(K * 0.5, K * 1.5, n)
+    call_values, put_values = black_scholes_call_put(S_range, K, T, r, sigma)
+    PV_K = K * discount_factor(r, T)
+    return S_range, call_values, put_values, PV_K
+
+
+@st.cache_data(max_entries=128)
+def expiration_breakdown_markdown(K):
+    """Markdown breakdown of both portfolios at expiration for strike K."""
+    return f"""
+**Portfolio A (Fiduciary Call):**
+- Long call option: max(S_T - K, 0)
+- Zero-coupon bond paying K: £{K:.0f}
+- **Total value: max(S_T, K)**
+
+**Portfolio B (Protective Put):**
+- Long put option: max(K - S_T, 0)
+- Underlying stock: S_T
+- **Total value: max(S_T, K)**
+
+Both portfolios always equal max(S_T, K) at expiration:
+- If S_T > K, Portfolio A = (S_T - K) + K = S_T
+- If S_T < K, Portfolio A = 0 + K = K
+- If S_T > K, Portfolio B = 0 + S_T = S_T
+- If S_T < K, Portfolio B = (K - S_T) + S_T = K
+
+The purple and teal lines overlap perfectly, confirming the parity relationship.
+"""
+
+
+@st.cache_data(max_entries=128)
+def pre_expiration_sample_markdown(K, T, r, sigma):
+    """Markdown of the at-the-money call, put, bond and portfolio values."""
+    S_range, call_values, put_values, PV_K = compute_pre_expiration_grid(K, T, r, sigma)
+    # S_range is symmetric about K with an odd length, so the midpoint is exactly K
+    idx_atm = (len(S_range) - 1) // 2
+    return f"""
+**Sample values at S₀ = K (ATM):**
+- Call value: £{call_values[idx_atm]:.2f}
+- Put value: £{put_values[idx_atm]:.2f}
+- Bond PV(K): £{PV_K:.2f}
+- Portfolio A: £{call_values[idx_atm] + PV_K:.2f}
+- Portfolio B: £{put_values[idx_atm] + S_range[idx_atm]:.2f}
+"""
+
+
+# (colour, dash pattern, stroke width) for each line series in the parity charts
+SERIES_STYLE = {
+    "Call Payoff": ("blue", [6, 4], 1),
+    "Put Payoff": ("red", [6, 4], 1),
+    "Stock Value (S_T)": ("green", [6, 4], 1),
+    "Call Value (BS)": ("blue", [6, 4], 1),
+    "Put Value (BS)": ("red", [6, 4], 1),
+    "Stock Value (S₀)": ("green", [6, 4], 1),
+    "Portfolio A (Call + Bond)": ("purple", [1, 0], 2.5),
+    "Portfolio B (Put + Stock)": ("teal", [6, 4], 2.5),
+}
+
+
+LATEX_PARITY = r"""
         C + K e^{-rT} = P + S_0 \\ \\
 
         \text{or equivalently:} \\
@@ -68,8 +177,262 @@ with st.expander(label="Put-Call Parity Formula", expanded=True):
         T = \text{time to expiration (years)} \\
         K e^{-rT} = \text{present value of the strike price}
         """
-    st.code(latex_parity, language="latex")
-    st.latex(latex_parity)
+
+LATEX_SYNTHETICS = r"""
+        \text{Synthetic Long Call:} \quad C = P + S_0 - K e^{-rT} \\
+        \text{Synthetic Long Put:} \quad P = C + K e^{-rT} - S_0 \\
+        \text{Synthetic Long Stock:} \quad S_0 = C - P + K e^{-rT} \\
+        \text{Synthetic Forward:} \quad F_0 = S_0 - K e^{-rT} = C - P
+        """
+
+LATEX_DIVIDENDS = r"""
+        \text{Discrete dividends:} \quad C + K e^{-rT} = P + S_0 - PV(D) \\ \\
+
+        \text{Continuous dividend yield:} \quad C + K e^{-rT} = P + S_0 e^{-qT} \\ \\
+
+        where: \\
+        D = \text{known dividend payments during the option's life} \\
+        PV(D) = \text{present value of those dividends} \\
+        q = \text{continuous dividend yield}
+        """
+
+# Formula, components, use case and payoff of each synthetic position
+SYNTH_DETAILS = {
+    "Synthetic Long Call": {
+        "formula": r"C = P + S_0 - K e^{-rT}",
+        "components": [
+            "Buy the put option",
+            "Buy the underlying stock",
+            "Borrow the present value of the strike (sell a bond)",
+        ],
+        "use_case": (
+            "When call options are illiquid or relatively expensive compared to puts. "
+            "This replicates the call's payoff exactly."
+        ),
+        "payoff": "max(S_T - K, 0)  — identical to a long call",
+    },
+    "Synthetic Long Put": {
+        "formula": r"P = C + K e^{-rT} - S_0",
+        "components": [
+            "Buy the call option",
+            "Lend the present value of the strike (buy a bond)",
+            "Short the underlying stock",
+        ],
+        "use_case": (
+            "When put options are illiquid or mispriced. Also useful in markets where "
+            "puts are not available but calls are."
+        ),
+        "payoff": "max(K - S_T, 0)  — identical to a long put",
+    },
+    "Synthetic Long Stock": {
+        "formula": r"S_0 = C - P + K e^{-rT}",
+        "components": [
+            "Buy the call option",
+            "Sell the put option (same strike and expiry)",
+            "Lend the present value of the strike (buy a bond)",
+        ],
+        "use_case": (
+            "Create equity-like exposure without holding shares directly. "
+            "Useful for gaining leveraged exposure or when share purchase is restricted."
+        ),
+        "payoff": "S_T  — identical to holding the stock",
+    },
+    "Synthetic Forward": {
+        "formula": r"F_0 = C - P",
+        "components": [
+            "Buy the call option",
+            "Sell the put option (same strike and expiry)",
+        ],
+        "use_case": (
+            "Create forward contract exposure using options. The net premium "
+            "(C - P) equals the present value of the forward price minus the strike."
+        ),
+        "payoff": "S_T - K  — identical to a long forward at strike K",
+    },
+}
+
+# Arbitrage strategy markdown for each direction of a parity violation
+ARB_STRATEGY_POS = """
+**Portfolio A is overpriced relative to Portfolio B.**
+
+Sell the expensive portfolio, buy the cheap one:
+
+1. **Sell** the call option — receive £{call:.2f}
+2. **Borrow** the present value of K (sell the bond) — receive £{pv_strike:.2f}
+3. **Buy** the put option — pay £{put:.2f}
+4. **Buy** the stock — pay £{stock:.2f}
+
+**Net cash flow today: £{profit:.2f}** (risk-free profit)
+
+At expiration the long put + long stock position exactly offsets the short call +
+bond repayment obligation in every scenario.
+"""
+
+ARB_STRATEGY_NEG = """
+**Portfolio B is overpriced relative to Portfolio A.**
+
+Sell the expensive portfolio, buy the cheap one:
+
+1. **Buy** the call option — pay £{call:.2f}
+2. **Lend** PV(K) (buy the bond) — pay £{pv_strike:.2f}
+3. **Sell** the put option — receive £{put:.2f}
+4. **Short** the stock — receive £{stock:.2f}
+
+**Net cash flow today: £{profit:.2f}** (risk-free profit)
+
+At expiration the long call + bond position exactly offsets the short put + stock
+return obligation in every scenario.
+"""
+
+ARB_STRATEGY = {1: ARB_STRATEGY_POS, -1: ARB_STRATEGY_NEG}
+
+
+@st.cache_data(max_entries=128)
+def expiration_chart_data(K, show_components) -> "pd.DataFrame":
+    """Long-form DataFrame of the at-expiration chart series for strike K."""
+    import pandas as pd
+
+    s_T, portfolio_value = compute_expiration_grid(K)
+    series = {}
+    if show_components:
+        # Component payoffs are only needed when they are drawn
+        series["Call Payoff"] = np.maximum(s_T - K, 0)
+        series["Put Payoff"] = np.maximum(K - s_T, 0)
+        series["Stock Value (S_T)"] = s_T
+    series["Portfolio A (Call + Bond)"] = portfolio_value
+    series["Portfolio B (Put + Stock)"] = portfolio_value
+    return pd.DataFrame({"S": s_T, **series}).melt(
+        id_vars="S", var_name="series", value_name="value"
+    )
+
+
+@st.cache_data(max_entries=128)
+def pre_expiration_chart_data(K, T, r, sigma, show_components) -> "pd.DataFrame":
+    """Long-form DataFrame of the Black-Scholes pre-expiration chart series."""
+    import pandas as pd
+
+    S_range, call_values, put_values, PV_K = compute_pre_expiration_grid(K, T, r, sigma)
+    series = {}
+    if show_components:
+        series["Call Value (BS)"] = call_values
+        series["Put Value (BS)"] = put_values
+        series["Stock Value (S₀)"] = S_range
+    series["Portfolio A (Call + Bond)"] = call_values + PV_K
+    series["Portfolio B (Put + Stock)"] = put_values + S_range
+    return pd.DataFrame({"S": S_range, **series}).melt(
+        id_vars="S", var_name="series", value_name="value"
+    )
+
+
+def parity_chart(df, K, x_title, y_title, title, bond=None) -> "alt.LayerChart":
+    """Layer the series lines with the bond level and strike reference lines."""
+    import altair as alt
+    import pandas as pd
+
+    domain = list(df["series"].unique())
+    colours, dashes, widths = zip(*(SERIES_STYLE[name] for name in domain))
+
+    # One colour scale keys the series, the bond level and the strike line
+    strike_label = f"Strike: £{K:.0f}"
+    legend_domain = [*domain, strike_label]
+    legend_range = [*colours, "grey"]
+    if bond is not None:
+        bond_value, bond_label = bond
+        legend_domain.insert(-1, bond_label)
+        legend_range.insert(-1, "orange")
+    colour = alt.Color(
+        "series:N",
+        scale=alt.Scale(domain=legend_domain, range=legend_range),
+        legend=alt.Legend(title=None, orient="top-left"),
+    )
+
+    lines = (
+        alt.Chart(df)
+        .mark_line()
+        .encode(
+            x=alt.X("S:Q", title=x_title),
+            y=alt.Y("value:Q", title=y_title),
+            color=colour,
+            strokeDash=alt.StrokeDash(
+                "series:N",
+                scale=alt.Scale(domain=domain, range=list(dashes)),
+                legend=None,
+            ),
+            strokeWidth=alt.StrokeWidth(
+                "series:N",
+                scale=alt.Scale(domain=domain, range=list(widths)),
+                legend=None,
+            ),
+        )
+    )
+    strike = (
+        alt.Chart(pd.DataFrame({"S": [K], "series": [strike_label]}))
+        .mark_rule(strokeDash=[2, 2], opacity=0.5)
+        .encode(x="S:Q", color=colour, tooltip=["series:N"])
+    )
+    chart = lines + strike
+    if bond is not None:
+        # The bond pays a constant, so draw it as a level rather than a series
+        chart += (
+            alt.Chart(pd.DataFrame({"value": [bond_value], "series": [bond_label]}))
+            .mark_rule(strokeDash=[6, 4], opacity=0.6)
+            .encode(y="value:Q", color=colour, tooltip=["series:N"])
+        )
+    return chart.properties(title=title, height=450)
+
+
+@st.cache_resource(max_entries=64)
+def build_expiration_chart(K, show_components) -> "alt.LayerChart":
+    """Build the at-expiration component chart, reusing the cached spec."""
+    import altair as alt
+
+    df = expiration_chart_data(K, show_components)
+    chart = parity_chart(
+        df,
+        K,
+        "Stock Price at Expiration (S_T)",
+        "Value at Expiration",
+        "Put-Call Parity: Component Breakdown at Expiration",
+        bond=(K, f"Bond Value (K={K:.0f})") if show_components else None,
+    )
+    if show_components:
+        # Shade where the call and put payoffs are in the money
+        for name, colour in [("Call Payoff", "blue"), ("Put Payoff", "red")]:
+            chart += (
+                alt.Chart(df)
+                .transform_filter(alt.datum.series == name)
+                .mark_area(color=colour, opacity=0.15)
+                .encode(x="S:Q", y="value:Q")
+            )
+    return chart
+
+
+@st.cache_resource(max_entries=64)
+def build_pre_expiration_chart(K, T, r, sigma, show_components) -> "alt.LayerChart":
+    """Build the Black-Scholes pre-expiration chart, reusing the cached spec."""
+    PV_K = compute_pre_expiration_grid(K, T, r, sigma)[3]
+    return parity_chart(
+        pre_expiration_chart_data(K, T, r, sigma, show_components),
+        K,
+        "Current Stock Price (S₀)",
+        "Portfolio Value",
+        f"Pre-Expiration Portfolio Values "
+        f"(T={T:.1f}y, r={r * 100:.1f}%, σ={sigma * 100:.0f}%)",
+        bond=(PV_K, f"Bond PV(K) = £{PV_K:.2f}") if show_components else None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Section 1 – The Formula
+# ---------------------------------------------------------------------------
+
+st.markdown("#### The Put-Call Parity Relationship")
+
+st.write("The parity condition can be expressed in two equivalent forms:")
+
+with st.expander(label="Put-Call Parity Formula", expanded=True):
+    st.code(LATEX_PARITY, language="latex")
+    st.latex(LATEX_PARITY)
 
 st.write(
     "The left-hand side is known as a **Fiduciary Call** — a long call plus a zero-coupon "
@@ -116,101 +479,16 @@ with col_param2:
         key="show_comp_exp",
     )
 
-s_T = np.linspace(max(0, strike_exp - 50), strike_exp + 50, 200)
-
-call_payoff = np.maximum(s_T - strike_exp, 0)
-put_payoff = np.maximum(strike_exp - s_T, 0)
-bond_value = np.full_like(s_T, strike_exp)
-stock_value = s_T
-
-portfolio_A = call_payoff + bond_value
-portfolio_B = put_payoff + stock_value
+(strike_exp,) = quantise(strike_exp)
 
 chart_col, text_col = st.columns([3, 2])
 
 with chart_col:
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    if show_components_exp:
-        ax.plot(s_T, call_payoff, "b--", alpha=0.6, linewidth=1, label="Call Payoff")
-        ax.plot(s_T, put_payoff, "r--", alpha=0.6, linewidth=1, label="Put Payoff")
-        ax.plot(
-            s_T, stock_value, "g--", alpha=0.6, linewidth=1, label="Stock Value (S_T)"
-        )
-        ax.plot(
-            s_T,
-            bond_value,
-            color="orange",
-            linestyle="--",
-            alpha=0.6,
-            linewidth=1,
-            label=f"Bond Value (K={strike_exp:.0f})",
-        )
-
-        ax.fill_between(
-            s_T, call_payoff, 0, where=(call_payoff > 0), alpha=0.15, color="blue"
-        )
-        ax.fill_between(
-            s_T, put_payoff, 0, where=(put_payoff > 0), alpha=0.15, color="red"
-        )
-
-    ax.plot(
-        s_T,
-        portfolio_A,
-        color="purple",
-        linewidth=2.5,
-        label="Portfolio A (Call + Bond)",
-    )
-    ax.plot(
-        s_T,
-        portfolio_B,
-        color="teal",
-        linewidth=2.5,
-        linestyle="--",
-        label="Portfolio B (Put + Stock)",
-    )
-
-    ax.axvline(
-        x=strike_exp,
-        color="grey",
-        linestyle=":",
-        alpha=0.5,
-        label=f"Strike: £{strike_exp:.0f}",
-    )
-
-    ax.set_xlabel("Stock Price at Expiration (S_T)", fontsize=12)
-    ax.set_ylabel("Value at Expiration", fontsize=12)
-    ax.set_title(
-        "Put-Call Parity: Component Breakdown at Expiration",
-        fontsize=14,
-        fontweight="bold",
-    )
-    ax.legend(loc="upper left", fontsize=9)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    st.pyplot(fig)
+    st.altair_chart(build_expiration_chart(strike_exp, show_components_exp))
 
 with text_col:
     st.markdown("#### Portfolio Breakdown")
-    st.markdown(f"""
-**Portfolio A (Fiduciary Call):**
-- Long call option: max(S_T - K, 0)
-- Zero-coupon bond paying K: £{strike_exp:.0f}
-- **Total value: max(S_T, K)**
-
-**Portfolio B (Protective Put):**
-- Long put option: max(K - S_T, 0)
-- Underlying stock: S_T
-- **Total value: max(S_T, K)**
-
-Both portfolios always equal max(S_T, K) at expiration:
-- If S_T > K, Portfolio A = (S_T - K) + K = S_T
-- If S_T < K, Portfolio A = 0 + K = K
-- If S_T > K, Portfolio B = 0 + S_T = S_T
-- If S_T < K, Portfolio B = (K - S_T) + S_T = K
-
-The purple and teal lines overlap perfectly, confirming the parity relationship.
-""")
+    st.markdown(expiration_breakdown_markdown(strike_exp))
 
 
 # ---------------------------------------------------------------------------
@@ -271,13 +549,11 @@ with col_arb3:
         key="t_arb",
     )
 
-PV_K = K_arb * np.exp(-r_arb * T_arb)
-left_side = C_market + PV_K  # Portfolio A value
-right_side = P_market + S0_arb  # Portfolio B value
-difference = left_side - right_side
+K_arb, T_arb, r_arb = quantise(K_arb, T_arb, r_arb)
 
-C_implied = P_market + S0_arb - PV_K
-P_implied = C_market + PV_K - S0_arb
+PV_K, left_side, right_side, difference, C_implied, P_implied = parity_scalars(
+    K_arb, T_arb, r_arb, C_market, P_market, S0_arb
+)
 
 tolerance = 0.10
 
@@ -293,7 +569,10 @@ with col_res2:
     st.metric(label="Difference (A − B)", value=f"£{difference:.2f}")
     st.metric(label="Present Value of Strike", value=f"£{PV_K:.2f}")
 
-if abs(difference) < tolerance:
+# Arbitrage direction: 0 within tolerance, +1 when A is rich, -1 when B is rich
+arb_sign = 0 if abs(difference) < tolerance else (1 if difference > 0 else -1)
+
+if arb_sign == 0:
     st.success(
         "Put-Call Parity holds (within tolerance). No arbitrage opportunity exists."
     )
@@ -301,39 +580,16 @@ else:
     st.error("Put-Call Parity is violated! Arbitrage opportunity detected.")
 
     st.markdown("##### Arbitrage Strategy")
-
-    if difference > 0:
-        st.markdown(f"""
-**Portfolio A is overpriced relative to Portfolio B.**
-
-Sell the expensive portfolio, buy the cheap one:
-
-1. **Sell** the call option — receive £{C_market:.2f}
-2. **Borrow** the present value of K (sell the bond) — receive £{PV_K:.2f}
-3. **Buy** the put option — pay £{P_market:.2f}
-4. **Buy** the stock — pay £{S0_arb:.2f}
-
-**Net cash flow today: £{difference:.2f}** (risk-free profit)
-
-At expiration the long put + long stock position exactly offsets the short call +
-bond repayment obligation in every scenario.
-""")
-    else:
-        st.markdown(f"""
-**Portfolio B is overpriced relative to Portfolio A.**
-
-Sell the expensive portfolio, buy the cheap one:
-
-1. **Buy** the call option — pay £{C_market:.2f}
-2. **Lend** PV(K) (buy the bond) — pay £{PV_K:.2f}
-3. **Sell** the put option — receive £{P_market:.2f}
-4. **Short** the stock — receive £{S0_arb:.2f}
-
-**Net cash flow today: £{abs(difference):.2f}** (risk-free profit)
-
-At expiration the long call + bond position exactly offsets the short put + stock
-return obligation in every scenario.
-""")
+    st.markdown(
+        arbitrage_strategy_markdown(
+            arb_sign,
+            round(C_market, 2),
+            round(P_market, 2),
+            round(S0_arb, 2),
+            round(PV_K, 2),
+            round(abs(difference), 2),
+        )
+    )
 
 with st.expander("Implied Option Values"):
     st.markdown(f"""
@@ -363,82 +619,17 @@ st.write(
 )
 
 with st.expander("Synthetic Position Formulas", expanded=True):
-    latex_synthetics = r"""
-        \text{Synthetic Long Call:} \quad C = P + S_0 - K e^{-rT} \\
-        \text{Synthetic Long Put:} \quad P = C + K e^{-rT} - S_0 \\
-        \text{Synthetic Long Stock:} \quad S_0 = C - P + K e^{-rT} \\
-        \text{Synthetic Forward:} \quad F_0 = S_0 - K e^{-rT} = C - P
-        """
-    st.code(latex_synthetics, language="latex")
-    st.latex(latex_synthetics)
+    st.code(LATEX_SYNTHETICS, language="latex")
+    st.latex(LATEX_SYNTHETICS)
 
 synthetic_type = st.selectbox(
     "Select a synthetic position to explore",
-    [
-        "Synthetic Long Call",
-        "Synthetic Long Put",
-        "Synthetic Long Stock",
-        "Synthetic Forward",
-    ],
+    list(SYNTH_DETAILS),
     index=0,
     key="synth_select",
 )
 
-synth_details = {
-    "Synthetic Long Call": {
-        "formula": r"C = P + S_0 - K e^{-rT}",
-        "components": [
-            "Buy the put option",
-            "Buy the underlying stock",
-            "Borrow the present value of the strike (sell a bond)",
-        ],
-        "use_case": (
-            "When call options are illiquid or relatively expensive compared to puts. "
-            "This replicates the call's payoff exactly."
-        ),
-        "payoff": "max(S_T - K, 0)  — identical to a long call",
-    },
-    "Synthetic Long Put": {
-        "formula": r"P = C + K e^{-rT} - S_0",
-        "components": [
-            "Buy the call option",
-            "Lend the present value of the strike (buy a bond)",
-            "Short the underlying stock",
-        ],
-        "use_case": (
-            "When put options are illiquid or mispriced. Also useful in markets where "
-            "puts are not available but calls are."
-        ),
-        "payoff": "max(K - S_T, 0)  — identical to a long put",
-    },
-    "Synthetic Long Stock": {
-        "formula": r"S_0 = C - P + K e^{-rT}",
-        "components": [
-            "Buy the call option",
-            "Sell the put option (same strike and expiry)",
-            "Lend the present value of the strike (buy a bond)",
-        ],
-        "use_case": (
-            "Create equity-like exposure without holding shares directly. "
-            "Useful for gaining leveraged exposure or when share purchase is restricted."
-        ),
-        "payoff": "S_T  — identical to holding the stock",
-    },
-    "Synthetic Forward": {
-        "formula": r"F_0 = C - P",
-        "components": [
-            "Buy the call option",
-            "Sell the put option (same strike and expiry)",
-        ],
-        "use_case": (
-            "Create forward contract exposure using options. The net premium "
-            "(C - P) equals the present value of the forward price minus the strike."
-        ),
-        "payoff": "S_T - K  — identical to a long forward at strike K",
-    },
-}
-
-info = synth_details[synthetic_type]
+info = SYNTH_DETAILS[synthetic_type]
 
 col_synth1, col_synth2 = st.columns(2)
 
@@ -518,77 +709,15 @@ with col_pre3:
         key="show_comp_pre",
     )
 
-S_range = np.linspace(K_pre * 0.5, K_pre * 1.5, 200)
-
-call_values = black_scholes_call(S_range, K_pre, T_pre, r_pre, sigma_pre)
-put_values = black_scholes_put(S_range, K_pre, T_pre, r_pre, sigma_pre)
-PV_K_pre = K_pre * np.exp(-r_pre * T_pre)
-
-portfolio_A_pre = call_values + PV_K_pre
-portfolio_B_pre = put_values + S_range
+K_pre, T_pre, r_pre, sigma_pre = quantise(K_pre, T_pre, r_pre, sigma_pre)
 
 chart_col_pre, text_col_pre = st.columns([3, 2])
 
 with chart_col_pre:
-    fig2, ax2 = plt.subplots(figsize=(10, 6))
-
-    if show_components_pre:
-        ax2.plot(
-            S_range, call_values, "b--", alpha=0.6, linewidth=1, label="Call Value (BS)"
-        )
-        ax2.plot(
-            S_range, put_values, "r--", alpha=0.6, linewidth=1, label="Put Value (BS)"
-        )
-        ax2.axhline(
-            y=PV_K_pre,
-            color="orange",
-            linestyle="--",
-            alpha=0.6,
-            linewidth=1,
-            label=f"Bond PV(K) = £{PV_K_pre:.2f}",
-        )
-        ax2.plot(
-            S_range,
-            S_range,
-            "g--",
-            alpha=0.6,
-            linewidth=1,
-            label="Stock Value (S₀)",
-        )
-
-    ax2.plot(
-        S_range,
-        portfolio_A_pre,
-        color="purple",
-        linewidth=2.5,
-        label="Portfolio A (Call + Bond)",
-    )
-    ax2.plot(
-        S_range,
-        portfolio_B_pre,
-        color="teal",
-        linewidth=2.5,
-        linestyle="--",
-        label="Portfolio B (Put + Stock)",
-    )
-
-    ax2.axvline(
-        x=K_pre, color="grey", linestyle=":", alpha=0.5, label=f"Strike: £{K_pre:.0f}"
+    st.altair_chart(
+        build_pre_expiration_chart(K_pre, T_pre, r_pre, sigma_pre, show_components_pre)
     )
 
-    ax2.set_xlabel("Current Stock Price (S₀)", fontsize=12)
-    ax2.set_ylabel("Portfolio Value", fontsize=12)
-    ax2.set_title(
-        f"Pre-Expiration Portfolio Values "
-        f"(T={T_pre:.1f}y, r={r_pre * 100:.1f}%, σ={sigma_pre * 100:.0f}%)",
-        fontsize=13,
-        fontweight="bold",
-    )
-    ax2.legend(loc="upper left", fontsize=9)
-    ax2.grid(True, alpha=0.3)
-    plt.tight_layout()
-    st.pyplot(fig2)
-
 with text_col_pre:
     st.markdown("#### Understanding Pre-Expiration Values")
     st.markdown("""
@@ -602,15 +731,7 @@ put-call parity holds continuously throughout the option's life.
 - As T approaches 0, values converge to the at-expiration payoffs
 """)
 
-    idx_atm = np.argmin(np.abs(S_range - K_pre))
-    st.markdown(f"""
-**Sample values at S₀ = K (ATM):**
-- Call value: £{call_values[idx_atm]:.2f}
-- Put value: £{put_values[idx_atm]:.2f}
-- Bond PV(K): £{PV_K_pre:.2f}
-- Portfolio A: £{portfolio_A_pre[idx_atm]:.2f}
-- Portfolio B: £{portfolio_B_pre[idx_atm]:.2f}
-""")
+    st.markdown(pre_expiration_sample_markdown(K_pre, T_pre, r_pre, sigma_pre))
 
 
 # ---------------------------------------------------------------------------
@@ -664,18 +785,8 @@ st.write(
 )
 
 with st.expander("Dividend-Adjusted Formulas", expanded=False):
-    latex_div = r"""
-        \text{Discrete dividends:} \quad C + K e^{-rT} = P + S_0 - PV(D) \\ \\
-
-        \text{Continuous dividend yield:} \quad C + K e^{-rT} = P + S_0 e^{-qT} \\ \\
-
-        where: \\
-        D = \text{known dividend payments during the option's life} \\
-        PV(D) = \text{present value of those dividends} \\
-        q = \text{continuous dividend yield}
-        """
-    st.code(latex_div, language="latex")
-    st.latex(latex_div)
+    st.code(LATEX_DIVIDENDS, language="latex")
+    st.latex(LATEX_DIVIDENDS)
 
 st.write(
     "**Intuition:** Holding the stock entitles you to receive dividends, but holding a "
@@ -730,8 +841,10 @@ with col_div2:
         / 100
     )
 
-PV_K_div = K_div * np.exp(-r_div * T_div)
-S_adj = S0_div * np.exp(-q_div * T_div)
+T_div, r_div, q_div = quantise(T_div, r_div, q_div)
+
+PV_K_div = K_div * discount_factor(r_div, T_div)
+S_adj = S0_div * discount_factor(q_div, T_div)
 P_implied_div = C_div + PV_K_div - S_adj
 P_implied_no_div = C_div + PV_K_div - S0_div
 
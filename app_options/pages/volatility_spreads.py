@@ -1,43 +1,344 @@
+import io
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from scipy.special import ndtr
+import math
+from typing import TYPE_CHECKING
+
+from _mpl_style import MPL_RC_PARAMS
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 st.set_page_config(layout="wide")
 st.markdown("### Volatility Spreads")
 
-strategy = st.selectbox(
-    "Volatility Spreads",
-    [
-        "Straddle",
-        "Strangle",
-        "Butterfly",
-        "Condor",
-        "Ratio Spread",
-        "Christmas Tree",
-        "Calendar Spread",
-        "Time Butterfly",
-        "Diagonal Spreads",
-    ],
-    index=0,
-    help="Select a volatility spread strategy to visualise.",
-)
 
-st.markdown("---")
+def payoff_vertices(lower, upper, *strikes):
+    """Plot range end points and the strikes inside it, sorted and de-duplicated.
+
+    The expiry payoffs are piecewise linear with kinks only at the strikes, so
+    evaluating them at these points draws the same lines as a dense grid.
+    """
+    lo, hi = min(lower, upper), max(lower, upper)
+    return np.unique(np.clip(np.array([lower, *strikes, upper], np.float32), lo, hi))
+
+
+def relu(x):
+    """max(x, 0) computed branch-free as (x + |x|) / 2, which is exact in floats."""
+    return 0.5 * (x + np.abs(x))
+
+
+def call_legs_payoff(stock_prices, strikes, quantities, net_cash):
+    """Expiry P/L of a call portfolio with one (strike, quantity) leg per call.
+
+    Every piecewise call strategy shares this kernel. All legs are evaluated in
+    one (legs, prices) broadcast and summed by their quantities in a single
+    matrix product, on top of the net premium cash flow.
+    """
+    dtype = stock_prices.dtype
+    legs = stock_prices - np.asarray(strikes, dtype)[:, np.newaxis]
+    np.clip(legs, 0, None, out=legs)
+    payoff = np.asarray(quantities, dtype) @ legs
+    payoff += net_cash
+    return payoff
+
+
+@st.cache_data(max_entries=64)
+def compute_straddle(strike, call_premium, put_premium):
+    """Long straddle P/L at its payoff vertices with its lower and upper break-evens."""
+    total_premium = call_premium + put_premium
+    stock_prices = payoff_vertices(strike * 0.5, strike * 1.5, strike)
+
+    # Long straddle payoff
+    call_payoff = relu(stock_prices - strike)
+    put_payoff = relu(strike - stock_prices)
+    payoff = call_payoff + put_payoff - total_premium
+
+    return stock_prices, payoff, strike - total_premium, strike + total_premium
+
 
-# Common parameters
-col1, col2 = st.columns(2)
+@st.cache_data(max_entries=64)
+def compute_strangle(put_strike, call_strike, call_premium, put_premium):
+    """Long strangle P/L at its payoff vertices with its lower and upper break-evens."""
+    total_premium = call_premium + put_premium
+    stock_prices = payoff_vertices(
+        put_strike * 0.5, call_strike * 1.5, put_strike, call_strike
+    )
+
+    call_payoff = relu(stock_prices - call_strike)
+    put_payoff = relu(put_strike - stock_prices)
+    payoff = call_payoff + put_payoff - total_premium
+
+    return (
+        stock_prices,
+        payoff,
+        put_strike - total_premium,
+        call_strike + total_premium,
+    )
+
+
+@st.cache_data(max_entries=64)
+def compute_butterfly(lower_strike, middle_strike, upper_strike, net_debit):
+    """Long call butterfly P/L at its payoff vertices for the given net debit."""
+    stock_prices = payoff_vertices(
+        lower_strike * 0.7,
+        upper_strike * 1.3,
+        lower_strike,
+        middle_strike,
+        upper_strike,
+    )
+
+    # Long butterfly: +1 K1 call, -2 K2 calls, +1 K3 call
+    payoff = call_legs_payoff(
+        stock_prices,
+        (lower_strike, middle_strike, upper_strike),
+        (1, -2, 1),
+        -net_debit,
+    )
+
+    return stock_prices, payoff
+
+
+@st.cache_data(max_entries=64)
+def compute_condor(k1, k2, k3, k4, net_debit):
+    """Long call condor P/L at its payoff vertices for the given net debit."""
+    stock_prices = payoff_vertices(k1 * 0.7, k4 * 1.3, k1, k2, k3, k4)
+
+    # Long condor: +1 K1 call, -1 K2 call, -1 K3 call, +1 K4 call
+    payoff = call_legs_payoff(
+        stock_prices, (k1, k2, k3, k4), (1, -1, -1, 1), -net_debit
+    )
+
+    return stock_prices, payoff
+
+
+@st.cache_data(max_entries=64)
+def compute_ratio_spread(lower_strike, upper_strike, buy_qty, sell_qty, net_credit):
+    """Ratio call spread P/L at its payoff vertices for the given net credit."""
+    stock_prices = payoff_vertices(
+        lower_strike * 0.7, upper_strike * 1.5, lower_strike, upper_strike
+    )
 
-with col1:
-    spot_price = st.number_input(
-        "Current Stock Price",
-        min_value=1.0,
-        value=100.0,
-        step=1.0,
-        help="Current price of the underlying stock.",
+    # Ratio call spread: +buy_qty K1 calls, -sell_qty K2 calls
+    payoff = call_legs_payoff(
+        stock_prices, (lower_strike, upper_strike), (buy_qty, -sell_qty), net_credit
     )
 
-# Strategy-specific inputs and calculations
-if strategy == "Straddle":
+    return stock_prices, payoff
+
+
+@st.cache_data(max_entries=64)
+def compute_christmas_tree(k1, k2, k3, net_debit):
+    """Christmas tree (ladder) call spread P/L at its payoff vertices."""
+    stock_prices = payoff_vertices(k1 * 0.7, k3 * 1.4, k1, k2, k3)
+
+    # Christmas tree: +1 K1 call, -1 K2 call, -1 K3 call
+    payoff = call_legs_payoff(stock_prices, (k1, k2, k3), (1, -1, -1), -net_debit)
+
+    return stock_prices, payoff
+
+
+def black_scholes_call(stock_prices, strike, sigma, T=30 / 365, r=0.05):
+    """Black-Scholes call value on a price grid, 30 days from expiry by default.
+
+    The scalar terms sigma*sqrt(T), the drift and the discounted strike are bound
+    once, leaving one log and two ndtr calls over the grid. They stay Python floats
+    so a float32 grid is not promoted to float64, and every grid step writes into
+    the d1 and d2 buffers in place.
+    """
+    sigma_sqrt_T = sigma * math.sqrt(T)
+    drift = (r + 0.5 * sigma * sigma) * T
+    discounted_strike = strike * math.exp(-r * T)
+
+    d1 = np.divide(stock_prices, strike)
+    np.log(d1, out=d1)
+    d1 += drift
+    d1 /= sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+
+    # C = S N(d1) - K e^{-rT} N(d2)
+    ndtr(d1, out=d1)
+    ndtr(d2, out=d2)
+    d1 *= stock_prices
+    d2 *= discounted_strike
+    d1 -= d2
+    return d1
+
+
+@st.cache_data(max_entries=64)
+def compute_calendar_spread(strike, net_debit, iv_far):
+    """Calendar spread P/L at near-term expiry, valuing the far leg by Black-Scholes."""
+    stock_prices = np.linspace(strike * 0.7, strike * 1.3, 200, dtype=np.float32)
+
+    # Near-term option is at expiry (intrinsic value only)
+    near_payoff = -relu(stock_prices - strike)  # Short call at expiry
+
+    # Far-term option still has time value (simplified Black-Scholes-like approximation)
+    far_value = black_scholes_call(stock_prices, strike, iv_far)
+
+    payoff = near_payoff + far_value - net_debit
+
+    return stock_prices, payoff
+
+
+@st.cache_data(max_entries=64)
+def compute_time_butterfly(strike, net_debit, iv):
+    """Time butterfly P/L at mid-term expiry, valuing the far leg by Black-Scholes."""
+    stock_prices = np.linspace(strike * 0.7, strike * 1.3, 200, dtype=np.float32)
+
+    # Time butterfly approximation at mid-term expiry
+    far_value = black_scholes_call(stock_prices, strike, iv)
+
+    # Near and mid are at expiry (intrinsic only)
+    near_payoff = relu(stock_prices - strike)
+    mid_payoff = -2 * relu(stock_prices - strike)
+
+    payoff = near_payoff + mid_payoff + far_value - net_debit
+
+    return stock_prices, payoff
+
+
+@st.cache_data(max_entries=64)
+def compute_diagonal_spread(near_strike, far_strike, net_debit, iv):
+    """Diagonal spread P/L at near-term expiry, valuing the far leg by Black-Scholes."""
+    stock_prices = np.linspace(
+        far_strike * 0.7, near_strike * 1.4, 200, dtype=np.float32
+    )
+
+    # At near-term expiry
+    near_payoff = -relu(stock_prices - near_strike)
+
+    # Far-term option still has time value
+    far_value = black_scholes_call(stock_prices, far_strike, iv)
+
+    payoff = near_payoff + far_value - net_debit
+
+    return stock_prices, payoff
+
+
+def build_payoff_figure(
+    stock_prices: np.ndarray,
+    payoff: np.ndarray,
+    line_label: str,
+    vlines: tuple,
+    xlabel: str,
+    title: str,
+    legend_fontsize=None,
+) -> "Figure":
+    """Build a strategy P/L chart.
+
+    vlines holds one (x, colour, linestyle, alpha, label) tuple per marker line.
+    """
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import to_rgba
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
+
+    with matplotlib.rc_context(MPL_RC_PARAMS):
+        # Create the figure outside the pyplot registry so it is freed once rendered,
+        # drawing straight onto an Agg canvas
+        fig = Figure(figsize=(8, 5))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        (payoff_line,) = ax.plot(stock_prices, payoff, "b-", linewidth=2)
+        ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
+
+        # Draw every marker line as one collection spanning the axes height, keyed in
+        # the legend by proxy lines that are never added to the axes
+        xs, colours, linestyles, alphas, labels = zip(*vlines)
+        ax.vlines(
+            xs,
+            0,
+            1,
+            transform=ax.get_xaxis_transform(),
+            colors=[to_rgba(colour, alpha) for colour, alpha in zip(colours, alphas)],
+            linestyles=list(linestyles),
+            linewidth=1,
+        )
+        proxies = [
+            Line2D([], [], color=colour, linestyle=linestyle, linewidth=1, alpha=alpha)
+            for colour, linestyle, alpha in zip(colours, linestyles, alphas)
+        ]
+
+        # Fill profit/loss regions from a single mask pass over the payoff, interpolating
+        # to the zero crossings that fall between the sparse piecewise-linear vertices
+        profit_mask = payoff > 0
+        ax.fill_between(
+            stock_prices,
+            payoff,
+            0,
+            where=profit_mask,
+            interpolate=True,
+            alpha=0.3,
+            color="green",
+        )
+        ax.fill_between(
+            stock_prices,
+            payoff,
+            0,
+            where=~profit_mask,
+            interpolate=True,
+            alpha=0.3,
+            color="red",
+        )
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel("Profit/Loss")
+        ax.set_title(title, fontsize=14, fontweight="bold")
+        ax.legend(
+            [payoff_line, *proxies],
+            [line_label, *labels],
+            loc="best",
+            fontsize=legend_fontsize,
+        )
+        ax.grid(True, alpha=0.3)
+
+        return fig
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def payoff_chart_png(
+    stock_prices: np.ndarray,
+    payoff: np.ndarray,
+    line_label: str,
+    vlines: tuple,
+    xlabel: str,
+    title: str,
+    legend_fontsize=None,
+) -> bytes:
+    """Strategy P/L chart as PNG bytes, cached so repeated inputs skip re-rendering."""
+    import matplotlib
+
+    fig = build_payoff_figure(
+        stock_prices, payoff, line_label, vlines, xlabel, title, legend_fontsize
+    )
+    buffer = io.BytesIO()
+    # Match the st.pyplot defaults so the chart looks the same as before, rendering
+    # under the same rc settings since the Agg chunk size is read at draw time
+    with matplotlib.rc_context(MPL_RC_PARAMS):
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    return buffer.getvalue()
+
+
+def input_columns():
+    """Two input columns, with the shared current stock price input in the first."""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.number_input(
+            "Current Stock Price",
+            min_value=1.0,
+            value=100.0,
+            step=1.0,
+            help="Current price of the underlying stock.",
+        )
+    return col1, col2
+
+
+@st.fragment
+def render_straddle() -> None:
+    """Render the straddle inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         strike = st.number_input(
             "Strike Price (ATM)",
@@ -53,54 +354,27 @@ if strategy == "Straddle":
         put_premium = st.number_input("Put Premium", min_value=0.0, value=5.0, step=0.5)
 
     total_premium = call_premium + put_premium
-    stock_prices = np.linspace(strike * 0.5, strike * 1.5, 200)
-
-    # Long straddle payoff
-    call_payoff = np.maximum(stock_prices - strike, 0)
-    put_payoff = np.maximum(strike - stock_prices, 0)
-    payoff = call_payoff + put_payoff - total_premium
-
-    break_even_lower = strike - total_premium
-    break_even_upper = strike + total_premium
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Straddle P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=strike,
-        color="red",
-        linestyle="--",
-        linewidth=1,
-        label=f"Strike: {strike:.0f}",
-    )
-    ax.axvline(
-        x=break_even_lower,
-        color="green",
-        linestyle="--",
-        linewidth=1,
-        label=f"BE Lower: {break_even_lower:.2f}",
+    stock_prices, payoff, break_even_lower, break_even_upper = compute_straddle(
+        strike, call_premium, put_premium
     )
-    ax.axvline(
-        x=break_even_upper,
-        color="green",
-        linestyle=":",
-        linewidth=1,
-        label=f"BE Upper: {break_even_upper:.2f}",
-    )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
+
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Straddle P/L",
+        (
+            (strike, "red", "--", 1.0, f"Strike: {strike:.0f}"),
+            (break_even_lower, "green", "--", 1.0, f"BE Lower: {break_even_lower:.2f}"),
+            (break_even_upper, "green", ":", 1.0, f"BE Upper: {break_even_upper:.2f}"),
+        ),
+        "Stock Price at Expiration",
+        "Long Straddle Payoff",
     )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Long Straddle Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -126,7 +400,11 @@ about the direction. Common before earnings announcements or major economic even
             f"**Break-even Points:** £{break_even_lower:.2f} and £{break_even_upper:.2f}"
         )
 
-elif strategy == "Strangle":
+
+@st.fragment
+def render_strangle() -> None:
+    """Render the strangle inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         put_strike = st.number_input(
             "Put Strike (Lower)",
@@ -149,60 +427,28 @@ elif strategy == "Strangle":
         put_premium = st.number_input("Put Premium", min_value=0.0, value=3.0, step=0.5)
 
     total_premium = call_premium + put_premium
-    stock_prices = np.linspace(put_strike * 0.5, call_strike * 1.5, 200)
-
-    call_payoff = np.maximum(stock_prices - call_strike, 0)
-    put_payoff = np.maximum(put_strike - stock_prices, 0)
-    payoff = call_payoff + put_payoff - total_premium
-
-    break_even_lower = put_strike - total_premium
-    break_even_upper = call_strike + total_premium
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Strangle P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=put_strike,
-        color="red",
-        linestyle="--",
-        linewidth=1,
-        label=f"Put Strike: {put_strike:.0f}",
+    stock_prices, payoff, break_even_lower, break_even_upper = compute_strangle(
+        put_strike, call_strike, call_premium, put_premium
     )
-    ax.axvline(
-        x=call_strike,
-        color="red",
-        linestyle=":",
-        linewidth=1,
-        label=f"Call Strike: {call_strike:.0f}",
-    )
-    ax.axvline(
-        x=break_even_lower,
-        color="green",
-        linestyle="--",
-        linewidth=1,
-        label=f"BE Lower: {break_even_lower:.2f}",
-    )
-    ax.axvline(
-        x=break_even_upper,
-        color="green",
-        linestyle=":",
-        linewidth=1,
-        label=f"BE Upper: {break_even_upper:.2f}",
-    )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
+
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Strangle P/L",
+        (
+            (put_strike, "red", "--", 1.0, f"Put Strike: {put_strike:.0f}"),
+            (call_strike, "red", ":", 1.0, f"Call Strike: {call_strike:.0f}"),
+            (break_even_lower, "green", "--", 1.0, f"BE Lower: {break_even_lower:.2f}"),
+            (break_even_upper, "green", ":", 1.0, f"BE Upper: {break_even_upper:.2f}"),
+        ),
+        "Stock Price at Expiration",
+        "Long Strangle Payoff",
     )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Long Strangle Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -234,7 +480,11 @@ direction. The stock needs to move further to profit compared to a straddle.
         "\n- Strangles are cheaper because both options are out-of-the-money and have lower premiums. "
     )
 
-elif strategy == "Butterfly":
+
+@st.fragment
+def render_butterfly() -> None:
+    """Render the butterfly spread inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         lower_strike = st.number_input(
             "Lower Strike (K1)",
@@ -266,58 +516,31 @@ elif strategy == "Butterfly":
         )
 
     net_debit = lower_premium - 2 * middle_premium + upper_premium
-    stock_prices = np.linspace(lower_strike * 0.7, upper_strike * 1.3, 200)
-
-    # Long butterfly: +1 K1 call, -2 K2 calls, +1 K3 call
-    long_k1 = np.maximum(stock_prices - lower_strike, 0)
-    short_k2 = -2 * np.maximum(stock_prices - middle_strike, 0)
-    long_k3 = np.maximum(stock_prices - upper_strike, 0)
-    payoff = long_k1 + short_k2 + long_k3 - net_debit
+    stock_prices, payoff = compute_butterfly(
+        lower_strike, middle_strike, upper_strike, net_debit
+    )
 
     max_profit = middle_strike - lower_strike - net_debit
     break_even_lower = lower_strike + net_debit
     break_even_upper = upper_strike - net_debit
 
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Butterfly P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=lower_strike,
-        color="red",
-        linestyle="--",
-        linewidth=1,
-        alpha=0.7,
-        label=f"K1: {lower_strike:.0f}",
-    )
-    ax.axvline(
-        x=middle_strike,
-        color="red",
-        linestyle="-",
-        linewidth=1,
-        label=f"K2: {middle_strike:.0f}",
-    )
-    ax.axvline(
-        x=upper_strike,
-        color="red",
-        linestyle=":",
-        linewidth=1,
-        alpha=0.7,
-        label=f"K3: {upper_strike:.0f}",
-    )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Butterfly P/L",
+        (
+            (lower_strike, "red", "--", 0.7, f"K1: {lower_strike:.0f}"),
+            (middle_strike, "red", "-", 1.0, f"K2: {middle_strike:.0f}"),
+            (upper_strike, "red", ":", 0.7, f"K3: {upper_strike:.0f}"),
+        ),
+        "Stock Price at Expiration",
+        "Long Butterfly Spread Payoff",
     )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Long Butterfly Spread Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -343,7 +566,11 @@ Ideal when implied volatility is high and expected to decrease.
             f"**Break-even Points:** £{break_even_lower:.2f} and £{break_even_upper:.2f}"
         )
 
-elif strategy == "Condor":
+
+@st.fragment
+def render_condor() -> None:
+    """Render the condor spread inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         k1 = st.number_input("Strike K1 (Lowest)", min_value=1.0, value=85.0, step=1.0)
         k2 = st.number_input("Strike K2", min_value=1.0, value=95.0, step=1.0)
@@ -366,45 +593,27 @@ elif strategy == "Condor":
         )
 
     net_debit = p1 - p2 - p3 + p4
-    stock_prices = np.linspace(k1 * 0.7, k4 * 1.3, 200)
-
-    # Long condor: +1 K1 call, -1 K2 call, -1 K3 call, +1 K4 call
-    payoff = (
-        np.maximum(stock_prices - k1, 0)
-        - np.maximum(stock_prices - k2, 0)
-        - np.maximum(stock_prices - k3, 0)
-        + np.maximum(stock_prices - k4, 0)
-        - net_debit
-    )
+    stock_prices, payoff = compute_condor(k1, k2, k3, k4, net_debit)
 
     max_profit = k2 - k1 - net_debit
 
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Condor P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    for k, label in [(k1, "K1"), (k2, "K2"), (k3, "K3"), (k4, "K4")]:
-        ax.axvline(
-            x=k,
-            color="red",
-            linestyle="--",
-            linewidth=1,
-            alpha=0.6,
-            label=f"{label}: {k:.0f}",
-        )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Condor P/L",
+        tuple(
+            (k, "red", "--", 0.6, f"{label}: {k:.0f}")
+            for k, label in [(k1, "K1"), (k2, "K2"), (k3, "K3"), (k4, "K4")]
+        ),
+        "Stock Price at Expiration",
+        "Long Condor Spread Payoff",
+        legend_fontsize=8,
     )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Long Condor Spread Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best", fontsize=8)
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -427,7 +636,11 @@ Offers a wider profit zone than a butterfly but lower maximum profit.
         st.markdown(f"**Max Profit:** £{max_profit:.2f} (between K2 and K3)")
         st.markdown(f"**Max Loss:** £{net_debit:.2f}")
 
-elif strategy == "Ratio Spread":
+
+@st.fragment
+def render_ratio_spread() -> None:
+    """Render the ratio call spread inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         lower_strike = st.number_input(
             "Lower Strike (Buy)",
@@ -458,48 +671,26 @@ elif strategy == "Ratio Spread":
         buy_qty, sell_qty = 2, 3
 
     net_credit = sell_qty * upper_premium - buy_qty * lower_premium
-    stock_prices = np.linspace(lower_strike * 0.7, upper_strike * 1.5, 200)
-
-    # Ratio call spread
-    long_calls = buy_qty * np.maximum(stock_prices - lower_strike, 0)
-    short_calls = sell_qty * np.maximum(stock_prices - upper_strike, 0)
-    payoff = long_calls - short_calls + net_credit
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Ratio Spread P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=lower_strike,
-        color="red",
-        linestyle="--",
-        linewidth=1,
-        label=f"Buy Strike: {lower_strike:.0f}",
-    )
-    ax.axvline(
-        x=upper_strike,
-        color="orange",
-        linestyle="--",
-        linewidth=1,
-        label=f"Sell Strike: {upper_strike:.0f}",
-    )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
-    )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title(
+    stock_prices, payoff = compute_ratio_spread(
+        lower_strike, upper_strike, buy_qty, sell_qty, net_credit
+    )
+
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Ratio Spread P/L",
+        (
+            (lower_strike, "red", "--", 1.0, f"Buy Strike: {lower_strike:.0f}"),
+            (upper_strike, "orange", "--", 1.0, f"Sell Strike: {upper_strike:.0f}"),
+        ),
+        "Stock Price at Expiration",
         f"Ratio Call Spread ({buy_qty}:{sell_qty}) Payoff",
-        fontsize=14,
-        fontweight="bold",
     )
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -525,7 +716,11 @@ This strategy requires careful risk management.
         st.markdown(f"**Max Profit:** At upper strike £{upper_strike:.0f}")
         st.markdown("**Risk:** Unlimited above upper strike")
 
-elif strategy == "Christmas Tree":
+
+@st.fragment
+def render_christmas_tree() -> None:
+    """Render the Christmas tree spread inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         k1 = st.number_input("Strike K1 (Buy 1)", min_value=1.0, value=95.0, step=1.0)
         k2 = st.number_input("Strike K2 (Sell 1)", min_value=1.0, value=100.0, step=1.0)
@@ -536,42 +731,25 @@ elif strategy == "Christmas Tree":
         p3 = st.number_input("K3 Premium (Sell)", min_value=0.0, value=3.0, step=0.5)
 
     net_debit = p1 - p2 - p3
-    stock_prices = np.linspace(k1 * 0.7, k3 * 1.4, 200)
+    stock_prices, payoff = compute_christmas_tree(k1, k2, k3, net_debit)
 
-    # Christmas tree: +1 K1 call, -1 K2 call, -1 K3 call
-    payoff = (
-        np.maximum(stock_prices - k1, 0)
-        - np.maximum(stock_prices - k2, 0)
-        - np.maximum(stock_prices - k3, 0)
-        - net_debit
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Christmas Tree P/L",
+        (
+            (k1, "green", "--", 1.0, f"K1 (Buy): {k1:.0f}"),
+            (k2, "red", "--", 1.0, f"K2 (Sell): {k2:.0f}"),
+            (k3, "red", ":", 1.0, f"K3 (Sell): {k3:.0f}"),
+        ),
+        "Stock Price at Expiration",
+        "Christmas Tree Spread Payoff",
     )
 
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Christmas Tree P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=k1, color="green", linestyle="--", linewidth=1, label=f"K1 (Buy): {k1:.0f}"
-    )
-    ax.axvline(
-        x=k2, color="red", linestyle="--", linewidth=1, label=f"K2 (Sell): {k2:.0f}"
-    )
-    ax.axvline(
-        x=k3, color="red", linestyle=":", linewidth=1, label=f"K3 (Sell): {k3:.0f}"
-    )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
-    )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Christmas Tree Spread Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
-
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -598,7 +776,11 @@ Loss also possible if stock stays below K1.
         st.markdown(f"**Max Profit:** £{max_profit:.2f} (at K2)")
         st.markdown("**Risk:** Unlimited above K3")
 
-elif strategy == "Calendar Spread":
+
+@st.fragment
+def render_calendar_spread() -> None:
+    """Render the calendar spread inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         strike = st.number_input(
             "Strike Price",
@@ -614,53 +796,24 @@ elif strategy == "Calendar Spread":
         far_premium = st.number_input(
             "Far-term Premium (Buy)", min_value=0.0, value=6.0, step=0.5
         )
-        iv_far = st.slider("Far-term IV (%)", 10, 100, 35) / 100
+        iv_far = st.slider("Far-term IV (%)", 10, 100, 35, step=5) / 100
 
     net_debit = far_premium - near_premium
-    stock_prices = np.linspace(strike * 0.7, strike * 1.3, 200)
-
-    # Near-term option is at expiry (intrinsic value only)
-    near_payoff = -np.maximum(stock_prices - strike, 0)  # Short call at expiry
-
-    # Far-term option still has time value (simplified Black-Scholes-like approximation)
-    remaining_time = 30 / 365  # Assume 30 days left on far option
-    d1 = (np.log(stock_prices / strike) + (0.05 + iv_far**2 / 2) * remaining_time) / (
-        iv_far * np.sqrt(remaining_time)
-    )
-    from scipy.stats import norm
-
-    far_value = stock_prices * norm.cdf(d1) - strike * np.exp(
-        -0.05 * remaining_time
-    ) * norm.cdf(d1 - iv_far * np.sqrt(remaining_time))
-
-    payoff = near_payoff + far_value - net_debit
+    stock_prices, payoff = compute_calendar_spread(strike, net_debit, iv_far)
 
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Calendar Spread P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=strike,
-        color="red",
-        linestyle="--",
-        linewidth=1,
-        label=f"Strike: {strike:.0f}",
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Calendar Spread P/L",
+        ((strike, "red", "--", 1.0, f"Strike: {strike:.0f}"),),
+        "Stock Price at Near-term Expiration",
+        "Calendar Spread Payoff (at near-term expiry)",
     )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
-    )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Near-term Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title(
-        "Calendar Spread Payoff (at near-term expiry)", fontsize=14, fontweight="bold"
-    )
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -685,7 +838,11 @@ Profits from the faster time decay of the near-term option.
         )
         st.markdown("**Max Loss:** Limited to net debit paid")
 
-elif strategy == "Time Butterfly":
+
+@st.fragment
+def render_time_butterfly() -> None:
+    """Render the time butterfly inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         strike = st.number_input(
             "Strike Price",
@@ -703,52 +860,24 @@ elif strategy == "Time Butterfly":
         far_premium = st.number_input(
             "Far-term Premium (Buy)", min_value=0.0, value=6.0, step=0.5
         )
-        iv = st.slider("Implied Volatility (%)", 10, 100, 30) / 100
+        iv = st.slider("Implied Volatility (%)", 10, 100, 30, step=5) / 100
 
     net_debit = near_premium - 2 * mid_premium + far_premium
-    stock_prices = np.linspace(strike * 0.7, strike * 1.3, 200)
-
-    # Time butterfly approximation at mid-term expiry
-    from scipy.stats import norm
-
-    remaining_time_far = 30 / 365
-    d1_far = (
-        np.log(stock_prices / strike) + (0.05 + iv**2 / 2) * remaining_time_far
-    ) / (iv * np.sqrt(remaining_time_far))
-    far_value = stock_prices * norm.cdf(d1_far) - strike * np.exp(
-        -0.05 * remaining_time_far
-    ) * norm.cdf(d1_far - iv * np.sqrt(remaining_time_far))
+    stock_prices, payoff = compute_time_butterfly(strike, net_debit, iv)
 
-    # Near and mid are at expiry (intrinsic only)
-    near_payoff = np.maximum(stock_prices - strike, 0)
-    mid_payoff = -2 * np.maximum(stock_prices - strike, 0)
-
-    payoff = near_payoff + mid_payoff + far_value - net_debit
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Time Butterfly P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=strike,
-        color="red",
-        linestyle="--",
-        linewidth=1,
-        label=f"Strike: {strike:.0f}",
-    )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Time Butterfly P/L",
+        ((strike, "red", "--", 1.0, f"Strike: {strike:.0f}"),),
+        "Stock Price at Mid-term Expiration",
+        "Time Butterfly Payoff",
     )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Mid-term Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Time Butterfly Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -770,7 +899,11 @@ A more complex time decay play than a simple calendar spread.
         st.markdown(f"**Net Debit:** £{net_debit:.2f}")
         st.markdown("**Best case:** Stock at strike at mid-term expiration")
 
-elif strategy == "Diagonal Spreads":
+
+@st.fragment
+def render_diagonal_spread() -> None:
+    """Render the diagonal spread inputs, payoff chart and explanation."""
+    col1, col2 = input_columns()
     with col1:
         near_strike = st.number_input(
             "Near-term Strike (Sell)",
@@ -791,58 +924,29 @@ elif strategy == "Diagonal Spreads":
         far_premium = st.number_input(
             "Far-term Premium (Buy)", min_value=0.0, value=7.0, step=0.5
         )
-        iv = st.slider("Implied Volatility (%)", 10, 100, 30) / 100
+        iv = st.slider("Implied Volatility (%)", 10, 100, 30, step=5) / 100
 
     net_debit = far_premium - near_premium
-    stock_prices = np.linspace(far_strike * 0.7, near_strike * 1.4, 200)
-
-    from scipy.stats import norm
-
-    # At near-term expiry
-    near_payoff = -np.maximum(stock_prices - near_strike, 0)
-
-    # Far-term option still has time value
-    remaining_time = 30 / 365
-    d1 = (np.log(stock_prices / far_strike) + (0.05 + iv**2 / 2) * remaining_time) / (
-        iv * np.sqrt(remaining_time)
+    stock_prices, payoff = compute_diagonal_spread(
+        near_strike, far_strike, net_debit, iv
     )
-    far_value = stock_prices * norm.cdf(d1) - far_strike * np.exp(
-        -0.05 * remaining_time
-    ) * norm.cdf(d1 - iv * np.sqrt(remaining_time))
 
-    payoff = near_payoff + far_value - net_debit
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-    ax.plot(stock_prices, payoff, "b-", linewidth=2, label="Diagonal Spread P/L")
-    ax.axhline(y=0, color="black", linestyle="-", linewidth=0.5)
-    ax.axvline(
-        x=near_strike,
-        color="orange",
-        linestyle="--",
-        linewidth=1,
-        label=f"Near Strike: {near_strike:.0f}",
-    )
-    ax.axvline(
-        x=far_strike,
-        color="blue",
-        linestyle="--",
-        linewidth=1,
-        label=f"Far Strike: {far_strike:.0f}",
+    png = payoff_chart_png(
+        stock_prices,
+        payoff,
+        "Diagonal Spread P/L",
+        (
+            (near_strike, "orange", "--", 1.0, f"Near Strike: {near_strike:.0f}"),
+            (far_strike, "blue", "--", 1.0, f"Far Strike: {far_strike:.0f}"),
+        ),
+        "Stock Price at Near-term Expiration",
+        "Diagonal Spread Payoff",
     )
-    ax.fill_between(
-        stock_prices, payoff, 0, where=(payoff > 0), alpha=0.3, color="green"
-    )
-    ax.fill_between(stock_prices, payoff, 0, where=(payoff < 0), alpha=0.3, color="red")
-    ax.set_xlabel("Stock Price at Near-term Expiration")
-    ax.set_ylabel("Profit/Loss")
-    ax.set_title("Diagonal Spread Payoff", fontsize=14, fontweight="bold")
-    ax.legend(loc="best")
-    ax.grid(True, alpha=0.3)
 
     chart_col, text_col = st.columns([3, 2])
 
     with chart_col:
-        st.pyplot(fig)
+        st.image(png, width="stretch")
 
     with text_col:
         st.markdown("#### Strategy Explanation")
@@ -868,3 +972,29 @@ Loss if stock moves significantly against the position or IV collapses.
             f"**Ideal scenario:** Stock at near-term strike ({near_strike:.0f}) at near-term expiry"
         )
         st.markdown("**Max Loss:** Limited to net debit if stock falls significantly")
+
+
+# Fragment renderer for each strategy, in selectbox order
+STRATEGIES = {
+    "Straddle": render_straddle,
+    "Strangle": render_strangle,
+    "Butterfly": render_butterfly,
+    "Condor": render_condor,
+    "Ratio Spread": render_ratio_spread,
+    "Christmas Tree": render_christmas_tree,
+    "Calendar Spread": render_calendar_spread,
+    "Time Butterfly": render_time_butterfly,
+    "Diagonal Spreads": render_diagonal_spread,
+}
+
+strategy = st.selectbox(
+    "Volatility Spreads",
+    list(STRATEGIES),
+    index=0,
+    help="Select a volatility spread strategy to visualise.",
+)
+
+st.markdown("---")
+
+# Strategy-specific inputs and calculations, each rerunning as its own fragment
+STRATEGIES[strategy]()
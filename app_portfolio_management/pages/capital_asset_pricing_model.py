@@ -1,6 +1,38 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import altair as alt
+
+LATEX_CAPM = r"""
+        E(R_i) = R_f + \beta_i (E(R_m) - R_f) \\ \\
+
+        where: \\
+        E(R_i) = \text{expected return of asset } i \\
+        R_f = \text{risk-free rate} \\
+        \beta_i = \text{beta of asset } i \\
+        E(R_m) = \text{expected return of the market} \\
+        E(R_m) - R_f = \text{market risk premium}
+        """
+
+LATEX_BETA = r"""
+        \beta_i = \frac{Cov(R_i, R_m)}{Var(R_m)} = \frac{\sigma_{i,m}}{\sigma_m^2} \\ \\
+
+        where: \\
+        Cov(R_i, R_m) = \text{covariance of asset returns with market returns} \\
+        Var(R_m) = \text{variance of market returns}
+        """
+
+LATEX_ALPHA = r"""
+        \alpha_i = R_i - E(R_i) = R_i - [R_f + \beta_i (R_m - R_f)] \\ \\
+
+        where: \\
+        \alpha_i = \text{Jensen's alpha for asset } i \\
+        R_i = \text{actual return of asset } i \\
+        E(R_i) = \text{CAPM expected return}
+        """
+
 
 st.set_page_config(layout="wide")
 st.markdown("### Capital Asset Pricing Model (CAPM)")
@@ -19,23 +51,150 @@ st.info(
 )
 
 
+# Assets that define the SML rather than being priced against it
+BENCHMARK_ASSETS = ("Market Portfolio", "Risk-Free Asset")
+
+
+@st.cache_data(max_entries=64)
+def compute_sml(risk_free_rate, market_return):
+    """End points of the Security Market Line, which is straight in beta."""
+    market_risk_premium = market_return - risk_free_rate
+    betas = np.array([-0.5, 2.5])
+    expected_returns = risk_free_rate + betas * market_risk_premium
+    return betas, expected_returns
+
+
+@st.cache_resource(max_entries=64)
+def build_sml_chart(
+    risk_free_rate,
+    market_return,
+    asset_names,
+    asset_betas,
+    asset_actuals,
+    asset_expected,
+    asset_colours,
+) -> "alt.LayerChart":
+    """Chart the SML with each asset, given as parallel tuples, and its alpha gap.
+
+    asset_expected holds the CAPM expected returns already computed by the page.
+    """
+    import altair as alt
+    import pandas as pd
+
+    betas_arr = np.array(asset_betas)
+    actuals_arr = np.array(asset_actuals)
+    expected_arr = np.array(asset_expected)
+    is_benchmark = np.isin(asset_names, BENCHMARK_ASSETS)
+
+    # Generate SML line
+    betas, expected_returns = compute_sml(risk_free_rate, market_return)
+
+    # Set axis limits
+    y_min = min(risk_free_rate - 2, expected_returns.min() - 2)
+    y_max = expected_returns.max() + 3
+    x = alt.X(
+        "beta:Q",
+        title="Beta (Systematic Risk)",
+        scale=alt.Scale(domain=[-0.6, 2.6], nice=False),
+    )
+    y = alt.Y(
+        "return:Q",
+        title="Expected Return (%)",
+        scale=alt.Scale(domain=[y_min, y_max], nice=False),
+    )
+
+    # One colour scale keys the SML, every asset and the risk-free level
+    sml_label = "Security Market Line (SML)"
+    risk_free_label = f"Risk-Free Rate = {risk_free_rate}%"
+    assets = pd.DataFrame(
+        {
+            "label": [
+                f"{name} (β={beta:.1f})" for name, beta in zip(asset_names, asset_betas)
+            ],
+            "beta": betas_arr,
+            "return": actuals_arr,
+            "expected": expected_arr,
+            "shape": np.where(is_benchmark, "circle", "square"),
+            "size": np.where(is_benchmark, 150, 120),
+        }
+    )
+    colour = alt.Color(
+        "label:N",
+        scale=alt.Scale(
+            domain=[sml_label, *assets["label"], risk_free_label],
+            range=["blue", *asset_colours, "gray"],
+        ),
+        legend=alt.Legend(title=None, orient="top-left"),
+    )
+
+    # Plot the SML
+    sml = (
+        alt.Chart(
+            pd.DataFrame(
+                {"label": sml_label, "beta": betas, "return": expected_returns}
+            )
+        )
+        .mark_line(strokeWidth=2)
+        .encode(x=x, y=y, color=colour)
+    )
+
+    # Risk-free level, plus reference lines at zero and market beta
+    risk_free = (
+        alt.Chart(
+            pd.DataFrame({"label": [risk_free_label], "return": [risk_free_rate]})
+        )
+        .mark_rule(strokeDash=[2, 2], opacity=0.5)
+        .encode(y="return:Q", color=colour)
+    )
+    zero_beta = (
+        alt.Chart(pd.DataFrame({"beta": [0.0]}))
+        .mark_rule(color="gray", opacity=0.3)
+        .encode(x="beta:Q")
+    )
+    market_beta = (
+        alt.Chart(pd.DataFrame({"beta": [1.0]}))
+        .mark_rule(color="gray", strokeDash=[2, 2], opacity=0.5)
+        .encode(x="beta:Q")
+    )
+
+    # Draw vertical lines to the SML for the non-benchmark assets with alpha
+    has_gap = (np.abs(actuals_arr - expected_arr) > 0.1) & ~is_benchmark
+    gaps = (
+        alt.Chart(assets[has_gap])
+        .mark_rule(strokeDash=[6, 4], opacity=0.5, strokeWidth=1.5)
+        .encode(x=x, y=y, y2="expected:Q", color=colour)
+    )
+
+    # Plot assets
+    points = (
+        alt.Chart(assets)
+        .mark_point(filled=True, opacity=1, clip=True)
+        .encode(
+            x=x,
+            y=y,
+            color=colour,
+            shape=alt.Shape("shape:N", scale=None),
+            size=alt.Size("size:Q", scale=None),
+            tooltip=[
+                "label:N",
+                alt.Tooltip("return:Q", title="Actual (%)", format=".2f"),
+                alt.Tooltip("expected:Q", title="CAPM (%)", format=".2f"),
+            ],
+        )
+    )
+
+    return (sml + risk_free + zero_beta + market_beta + gaps + points).properties(
+        title="Security Market Line (SML)", height=450
+    )
+
+
 st.markdown("#### The CAPM Equation")
 
 st.write("The expected return of an asset according to CAPM is given by:")
 
 with st.expander(label="CAPM Formula", expanded=True):
-    latex_capm = r"""
-        E(R_i) = R_f + \beta_i (E(R_m) - R_f) \\ \\
-
-        where: \\
-        E(R_i) = \text{expected return of asset } i \\
-        R_f = \text{risk-free rate} \\
-        \beta_i = \text{beta of asset } i \\
-        E(R_m) = \text{expected return of the market} \\
-        E(R_m) - R_f = \text{market risk premium}
-        """
-    st.code(latex_capm, language="latex")
-    st.latex(latex_capm)
+    st.code(LATEX_CAPM, language="latex")
+    st.latex(LATEX_CAPM)
 
 st.write(
     "The term $\\beta_i (E(R_m) - R_f)$ represents the risk premium for holding asset $i$. "
@@ -46,15 +205,8 @@ st.write(
 st.markdown("#### Understanding Beta")
 
 with st.expander(label="Beta Formula", expanded=True):
-    latex_beta = r"""
-        \beta_i = \frac{Cov(R_i, R_m)}{Var(R_m)} = \frac{\sigma_{i,m}}{\sigma_m^2} \\ \\
-
-        where: \\
-        Cov(R_i, R_m) = \text{covariance of asset returns with market returns} \\
-        Var(R_m) = \text{variance of market returns}
-        """
-    st.code(latex_beta, language="latex")
-    st.latex(latex_beta)
+    st.code(LATEX_BETA, language="latex")
+    st.latex(LATEX_BETA)
 
 st.write("""
 **Interpreting Beta:**
@@ -79,230 +231,173 @@ st.write(
     "compare to their CAPM-predicted returns."
 )
 
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("**Market Parameters**")
-    risk_free_rate = st.slider(
-        "Risk-Free Rate (%)",
-        min_value=0.0,
-        max_value=10.0,
-        value=3.0,
-        step=0.25,
-        key="rf",
-    )
-    market_return = st.slider(
-        "Expected Market Return (%)",
-        min_value=0.0,
-        max_value=20.0,
-        value=10.0,
-        step=0.5,
-        key="rm",
-    )
 
-with col2:
+@st.fragment
+def sml_explorer() -> None:
+    """Render the market and asset inputs, SML chart and alpha analysis."""
     st.markdown("**Sample Assets**")
     st.write("Add assets to plot on the SML:")
 
-    # Define some sample assets with beta and actual return
-    assets = {
-        "Market Portfolio": {"beta": 1.0, "actual": market_return, "color": "blue"},
-        "Risk-Free Asset": {"beta": 0.0, "actual": risk_free_rate, "color": "green"},
-    }
-
-    # User-defined assets
+    # User-defined assets. The checkbox decides whether the asset sliders are
+    # rendered, so it stays outside the form and applies straight away
     show_custom_assets = st.checkbox("Add custom assets", value=True)
 
-if show_custom_assets:
-    st.markdown("**Custom Assets**")
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        asset_a_beta = st.slider(
-            "Asset A Beta",
-            min_value=-0.5,
-            max_value=2.5,
-            value=1.3,
-            step=0.1,
-            key="beta_a",
-        )
-        asset_a_actual = st.slider(
-            "Asset A Actual Return (%)",
-            min_value=-5.0,
-            max_value=25.0,
-            value=14.0,
-            step=0.5,
-            key="actual_a",
-        )
-
-    with col2:
-        asset_b_beta = st.slider(
-            "Asset B Beta",
-            min_value=-0.5,
-            max_value=2.5,
-            value=0.7,
-            step=0.1,
-            key="beta_b",
+    # Batch the sliders so the chart and alpha analysis update once per submit rather
+    # than on every slider movement
+    with st.form("capm_params"):
+        st.markdown("**Market Parameters**")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            risk_free_rate = st.slider(
+                "Risk-Free Rate (%)",
+                min_value=0.0,
+                max_value=10.0,
+                value=3.0,
+                step=0.25,
+                key="rf",
+            )
+
+        with col2:
+            market_return = st.slider(
+                "Expected Market Return (%)",
+                min_value=0.0,
+                max_value=20.0,
+                value=10.0,
+                step=0.5,
+                key="rm",
+            )
+
+        # Sample assets as parallel name, beta, actual return and colour sequences,
+        # starting with the benchmark assets
+        asset_names = list(BENCHMARK_ASSETS)
+        asset_betas = [1.0, 0.0]
+        asset_actuals = [market_return, risk_free_rate]
+        asset_colours = ["blue", "green"]
+
+        if show_custom_assets:
+            st.markdown("**Custom Assets**")
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                asset_a_beta = st.slider(
+                    "Asset A Beta",
+                    min_value=-0.5,
+                    max_value=2.5,
+                    value=1.3,
+                    step=0.1,
+                    key="beta_a",
+                )
+                asset_a_actual = st.slider(
+                    "Asset A Actual Return (%)",
+                    min_value=-5.0,
+                    max_value=25.0,
+                    value=14.0,
+                    step=0.5,
+                    key="actual_a",
+                )
+
+            with col2:
+                asset_b_beta = st.slider(
+                    "Asset B Beta",
+                    min_value=-0.5,
+                    max_value=2.5,
+                    value=0.7,
+                    step=0.1,
+                    key="beta_b",
+                )
+                asset_b_actual = st.slider(
+                    "Asset B Actual Return (%)",
+                    min_value=-5.0,
+                    max_value=25.0,
+                    value=6.0,
+                    step=0.5,
+                    key="actual_b",
+                )
+
+            with col3:
+                asset_c_beta = st.slider(
+                    "Asset C Beta",
+                    min_value=-0.5,
+                    max_value=2.5,
+                    value=1.8,
+                    step=0.1,
+                    key="beta_c",
+                )
+                asset_c_actual = st.slider(
+                    "Asset C Actual Return (%)",
+                    min_value=-5.0,
+                    max_value=25.0,
+                    value=12.0,
+                    step=0.5,
+                    key="actual_c",
+                )
+
+            asset_names += ["Asset A", "Asset B", "Asset C"]
+            asset_betas += [asset_a_beta, asset_b_beta, asset_c_beta]
+            asset_actuals += [asset_a_actual, asset_b_actual, asset_c_actual]
+            asset_colours += ["red", "purple", "orange"]
+        st.form_submit_button("Update")
+
+    # Calculate market risk premium, then every asset's CAPM return and alpha at once
+    market_risk_premium = market_return - risk_free_rate
+    betas_arr = np.array(asset_betas)
+    actuals_arr = np.array(asset_actuals)
+    expected_arr = risk_free_rate + betas_arr * market_risk_premium
+    alphas_arr = actuals_arr - expected_arr
+
+    st.altair_chart(
+        build_sml_chart(
+            risk_free_rate,
+            market_return,
+            tuple(asset_names),
+            tuple(asset_betas),
+            tuple(asset_actuals),
+            tuple(expected_arr),
+            tuple(asset_colours),
         )
-        asset_b_actual = st.slider(
-            "Asset B Actual Return (%)",
-            min_value=-5.0,
-            max_value=25.0,
-            value=6.0,
-            step=0.5,
-            key="actual_b",
-        )
-
-    with col3:
-        asset_c_beta = st.slider(
-            "Asset C Beta",
-            min_value=-0.5,
-            max_value=2.5,
-            value=1.8,
-            step=0.1,
-            key="beta_c",
-        )
-        asset_c_actual = st.slider(
-            "Asset C Actual Return (%)",
-            min_value=-5.0,
-            max_value=25.0,
-            value=12.0,
-            step=0.5,
-            key="actual_c",
-        )
-
-    assets["Asset A"] = {"beta": asset_a_beta, "actual": asset_a_actual, "color": "red"}
-    assets["Asset B"] = {
-        "beta": asset_b_beta,
-        "actual": asset_b_actual,
-        "color": "purple",
-    }
-    assets["Asset C"] = {
-        "beta": asset_c_beta,
-        "actual": asset_c_actual,
-        "color": "orange",
-    }
-
-# Calculate market risk premium
-market_risk_premium = market_return - risk_free_rate
-
-# Generate SML line
-betas = np.linspace(-0.5, 2.5, 100)
-expected_returns = risk_free_rate + betas * market_risk_premium
-
-# Create visualisation
-fig, ax = plt.subplots(figsize=(10, 6))
-
-# Plot the SML
-ax.plot(
-    betas,
-    expected_returns,
-    "b-",
-    linewidth=2,
-    label="Security Market Line (SML)",
-)
-
-# Plot assets
-for name, asset in assets.items():
-    beta = asset["beta"]
-    actual = asset["actual"]
-    expected = risk_free_rate + beta * market_risk_premium
-    alpha = actual - expected
-
-    # Plot actual position
-    marker = "o" if name in ["Market Portfolio", "Risk-Free Asset"] else "s"
-    size = 150 if name in ["Market Portfolio", "Risk-Free Asset"] else 120
-    ax.scatter(
-        [beta],
-        [actual],
-        color=asset["color"],
-        s=size,
-        zorder=5,
-        marker=marker,
-        label=f"{name} (β={beta:.1f})",
     )
 
-    # Draw vertical line to SML if there's alpha
-    if abs(alpha) > 0.1 and name not in ["Market Portfolio", "Risk-Free Asset"]:
-        ax.plot(
-            [beta, beta],
-            [actual, expected],
-            color=asset["color"],
-            linestyle="--",
-            alpha=0.5,
-            linewidth=1.5,
-        )
-
-# Add labels
-ax.set_xlabel("Beta (Systematic Risk)", fontsize=12)
-ax.set_ylabel("Expected Return (%)", fontsize=12)
-ax.set_title("Security Market Line (SML)", fontsize=14)
-ax.axhline(
-    y=risk_free_rate,
-    color="gray",
-    linestyle=":",
-    alpha=0.5,
-    label=f"Risk-Free Rate = {risk_free_rate}%",
-)
-ax.axvline(x=0, color="gray", linestyle="-", alpha=0.3)
-ax.axvline(x=1, color="gray", linestyle=":", alpha=0.5)
-ax.legend(loc="upper left", fontsize=9)
-ax.grid(True, alpha=0.3)
-
-# Set axis limits
-ax.set_xlim(-0.6, 2.6)
-y_min = min(risk_free_rate - 2, min(expected_returns) - 2)
-y_max = max(expected_returns) + 3
-ax.set_ylim(y_min, y_max)
-
-plt.tight_layout()
-st.pyplot(fig)
+    st.markdown("#### Asset Analysis: Alpha (Jensen's Alpha)")
 
+    st.write(
+        "**Alpha** measures the excess return of an asset compared to its CAPM-predicted return. "
+        "It indicates whether an asset is overperforming or underperforming relative to its risk."
+    )
 
-st.markdown("#### Asset Analysis: Alpha (Jensen's Alpha)")
-
-st.write(
-    "**Alpha** measures the excess return of an asset compared to its CAPM-predicted return. "
-    "It indicates whether an asset is overperforming or underperforming relative to its risk."
-)
-
-with st.expander(label="Alpha Formula", expanded=False):
-    latex_alpha = r"""
-        \alpha_i = R_i - E(R_i) = R_i - [R_f + \beta_i (R_m - R_f)] \\ \\
+    with st.expander(label="Alpha Formula", expanded=False):
+        st.code(LATEX_ALPHA, language="latex")
+        st.latex(LATEX_ALPHA)
+
+    if show_custom_assets:
+        st.markdown("**Alpha Analysis for Custom Assets**")
+
+        # The custom assets follow the benchmark assets in the parallel arrays
+        n_benchmarks = len(BENCHMARK_ASSETS)
+        for col, name, beta, actual, expected, alpha in zip(
+            st.columns(3),
+            asset_names[n_benchmarks:],
+            betas_arr[n_benchmarks:],
+            actuals_arr[n_benchmarks:],
+            expected_arr[n_benchmarks:],
+            alphas_arr[n_benchmarks:],
+        ):
+            with col:
+                st.markdown(f"**{name}**")
+                st.metric("Beta", f"{beta:.2f}")
+                st.metric("CAPM Expected Return", f"{expected:.2f}%")
+                st.metric("Actual Return", f"{actual:.2f}%")
+
+                if alpha > 0.1:
+                    st.success(f"Alpha: +{alpha:.2f}% (Undervalued)")
+                elif alpha < -0.1:
+                    st.error(f"Alpha: {alpha:.2f}% (Overvalued)")
+                else:
+                    st.info(f"Alpha: {alpha:.2f}% (Fairly Valued)")
+
+
+sml_explorer()
 
-        where: \\
-        \alpha_i = \text{Jensen's alpha for asset } i \\
-        R_i = \text{actual return of asset } i \\
-        E(R_i) = \text{CAPM expected return}
-        """
-    st.code(latex_alpha, language="latex")
-    st.latex(latex_alpha)
-
-if show_custom_assets:
-    st.markdown("**Alpha Analysis for Custom Assets**")
-
-    cols = st.columns(3)
-    custom_assets = ["Asset A", "Asset B", "Asset C"]
-
-    for i, name in enumerate(custom_assets):
-        asset = assets[name]
-        beta = asset["beta"]
-        actual = asset["actual"]
-        expected = risk_free_rate + beta * market_risk_premium
-        alpha = actual - expected
-
-        with cols[i]:
-            st.markdown(f"**{name}**")
-            st.metric("Beta", f"{beta:.2f}")
-            st.metric("CAPM Expected Return", f"{expected:.2f}%")
-            st.metric("Actual Return", f"{actual:.2f}%")
-
-            if alpha > 0.1:
-                st.success(f"Alpha: +{alpha:.2f}% (Undervalued)")
-            elif alpha < -0.1:
-                st.error(f"Alpha: {alpha:.2f}% (Overvalued)")
-            else:
-                st.info(f"Alpha: {alpha:.2f}% (Fairly Valued)")
 
 st.write("""
 **Interpreting Alpha:**
@@ -1,6 +1,34 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import altair as alt
+
+# Five-pointed star as a Vega-Lite SVG path, which has no built-in star shape
+STAR_SHAPE = (
+    "M0,-1L0.2245,-0.309L0.9511,-0.309L0.3633,0.118L0.5878,0.809L0,0.382"
+    "L-0.5878,0.809L-0.3633,0.118L-0.9511,-0.309L-0.2245,-0.309Z"
+)
+
+LATEX_RETURN = r"""
+        R_p = w_1 R_1 + w_2 R_2 \\ \\
+
+        where: \\
+        R_p = \text{portfolio expected return} \\
+        w_1, w_2 = \text{weights of assets 1 and 2} \\
+        R_1, R_2 = \text{expected returns of assets 1 and 2}
+        """
+
+LATEX_VARIANCE = r"""
+        \sigma_p^2 = w_1^2 \sigma_1^2 + w_2^2 \sigma_2^2 + 2 w_1 w_2 \sigma_1 \sigma_2 \rho_{12} \\ \\
+
+        where: \\
+        \sigma_p^2 = \text{portfolio variance} \\
+        \sigma_1, \sigma_2 = \text{standard deviations of assets 1 and 2} \\
+        \rho_{12} = \text{correlation between assets 1 and 2}
+        """
+
 
 st.set_page_config(layout="wide")
 st.markdown("### Modern Portfolio Theory - Efficient Frontier")
@@ -18,6 +46,163 @@ st.info(
 )
 
 
+def portfolio_risk_return(weights, expected_returns, covariance):
+    """Volatility and expected return of each row of an (n, N) weight matrix.
+
+    Works for any number of assets N, with the variance of each row w taken as
+    w Σ wᵀ in one einsum rather than the expanded two-asset formula.
+    """
+    variances = np.einsum("ij,jk,ik->i", weights, covariance, weights)
+    # A perfectly hedged portfolio can round to a tiny negative variance
+    np.clip(variances, 0, None, out=variances)
+    return np.sqrt(variances), weights @ expected_returns
+
+
+@st.cache_data(max_entries=64)
+def compute_frontier(r1, r2, sigma1, sigma2, rho, n=25):
+    """Two-asset frontier risks and returns plus the minimum variance portfolio.
+
+    Inputs and outputs are in percent; returns (risks, returns, w1_min_var,
+    min_var_return, min_var_risk).
+    """
+    # Convert percentages to decimals
+    r1_dec = r1 / 100
+    r2_dec = r2 / 100
+    sigma1_dec = sigma1 / 100
+    sigma2_dec = sigma2 / 100
+
+    # Find minimum variance portfolio
+    # Analytical solution for two assets, w1 = a2 / (a1 + a2). Adding the same
+    # epsilon to both parts keeps it well defined without a branch, and gives an
+    # even split when identical, perfectly correlated assets make every weight
+    # equally risky.
+    eps = 1e-12
+    covariance_12 = sigma1_dec * sigma2_dec * rho
+    a1 = sigma1_dec**2 - covariance_12
+    a2 = sigma2_dec**2 - covariance_12
+    w1_min_var = np.clip((a2 + eps) / (a1 + a2 + 2 * eps), 0, 1)
+
+    # The frontier is a hyperbola in risk-return space that bends most sharply at
+    # the minimum variance weight, so space the weights quadratically towards it
+    # from both ends. The n samples then follow the curve more closely than four
+    # times as many evenly spaced ones, and the ρ = -1 kink lands on a sample.
+    t = np.linspace(0, 1, n // 2 + 1) ** 2
+    w1 = np.union1d(w1_min_var * (1 - t), w1_min_var + (1 - w1_min_var) * t)
+    weights = np.column_stack([w1, 1 - w1])
+    expected_returns = np.array([r1_dec, r2_dec])
+    covariance = np.array(
+        [
+            [sigma1_dec**2, rho * sigma1_dec * sigma2_dec],
+            [rho * sigma1_dec * sigma2_dec, sigma2_dec**2],
+        ]
+    )
+    portfolio_risks, portfolio_returns = portfolio_risk_return(
+        weights, expected_returns, covariance
+    )
+    portfolio_risks *= 100
+    portfolio_returns *= 100
+
+    (min_var_risk,), (min_var_return,) = portfolio_risk_return(
+        np.array([[w1_min_var, 1 - w1_min_var]]), expected_returns, covariance
+    )
+    min_var_risk *= 100
+    min_var_return *= 100
+
+    return (
+        portfolio_risks,
+        portfolio_returns,
+        w1_min_var,
+        min_var_return,
+        min_var_risk,
+    )
+
+
+@st.cache_resource(max_entries=64)
+def build_frontier_chart(r1, r2, sigma1, sigma2, rho) -> "alt.LayerChart":
+    """Chart the two-asset frontier with both assets and the minimum variance point."""
+    import altair as alt
+    import pandas as pd
+
+    portfolio_risks, portfolio_returns, w1_min_var, min_var_return, min_var_risk = (
+        compute_frontier(r1, r2, sigma1, sigma2, rho)
+    )
+
+    # Set axis limits with some padding
+    x_min = max(0, min(portfolio_risks) - 2)
+    x_max = max(portfolio_risks) + 2
+    y_min = max(0, min(portfolio_returns) - 1)
+    y_max = max(portfolio_returns) + 1
+    x = alt.X(
+        "risk:Q",
+        title="Portfolio Risk (Standard Deviation) %",
+        scale=alt.Scale(domain=[x_min, x_max], nice=False),
+    )
+    y = alt.Y(
+        "return:Q",
+        title="Expected Return %",
+        scale=alt.Scale(domain=[y_min, y_max], nice=False),
+    )
+
+    # One colour scale keys the frontier line and every marked portfolio
+    points = pd.DataFrame(
+        {
+            "label": [
+                "Asset 1 (w₁=100%)",
+                "Asset 2 (w₂=100%)",
+                f"Min Variance (w₁={w1_min_var:.0%})",
+            ],
+            "risk": [sigma1, sigma2, min_var_risk],
+            "return": [r1, r2, min_var_return],
+            "shape": ["circle", "circle", STAR_SHAPE],
+            "size": [150, 150, 300],
+        }
+    )
+    domain = ["Portfolio Combinations", *points["label"]]
+    colour = alt.Color(
+        "label:N",
+        scale=alt.Scale(domain=domain, range=["blue", "red", "green", "orange"]),
+        legend=alt.Legend(title=None, orient="top-left"),
+    )
+
+    # Plot the efficient frontier in weight order, as it can double back in risk
+    frontier = (
+        alt.Chart(
+            pd.DataFrame(
+                {
+                    "label": "Portfolio Combinations",
+                    "risk": portfolio_risks,
+                    "return": portfolio_returns,
+                    "order": np.arange(len(portfolio_risks)),
+                }
+            )
+        )
+        .mark_line(strokeWidth=2, clip=True)
+        .encode(x=x, y=y, order="order:Q", color=colour)
+    )
+
+    # Mark individual assets and the minimum variance portfolio
+    markers = (
+        alt.Chart(points)
+        .mark_point(filled=True, opacity=1, clip=True)
+        .encode(
+            x=x,
+            y=y,
+            color=colour,
+            shape=alt.Shape("shape:N", scale=None),
+            size=alt.Size("size:Q", scale=None),
+            tooltip=[
+                "label:N",
+                alt.Tooltip("risk:Q", format=".2f"),
+                alt.Tooltip("return:Q", format=".2f"),
+            ],
+        )
+    )
+
+    return (frontier + markers).properties(
+        title="Efficient Frontier - Two Asset Portfolio", height=450
+    )
+
+
 st.markdown("#### Two-Asset Portfolio Mathematics")
 
 st.write(
@@ -26,16 +211,8 @@ st.write(
 )
 
 with st.expander(label="Portfolio Return", expanded=True):
-    latex_return = r"""
-        R_p = w_1 R_1 + w_2 R_2 \\ \\
-
-        where: \\
-        R_p = \text{portfolio expected return} \\
-        w_1, w_2 = \text{weights of assets 1 and 2} \\
-        R_1, R_2 = \text{expected returns of assets 1 and 2}
-        """
-    st.code(latex_return, language="latex")
-    st.latex(latex_return)
+    st.code(LATEX_RETURN, language="latex")
+    st.latex(LATEX_RETURN)
 
 st.write(
     "The portfolio return is simply the weighted average of the individual asset returns. "
@@ -43,16 +220,8 @@ st.write(
 )
 
 with st.expander(label="Portfolio Variance (Risk)", expanded=True):
-    latex_variance = r"""
-        \sigma_p^2 = w_1^2 \sigma_1^2 + w_2^2 \sigma_2^2 + 2 w_1 w_2 \sigma_1 \sigma_2 \rho_{12} \\ \\
-
-        where: \\
-        \sigma_p^2 = \text{portfolio variance} \\
-        \sigma_1, \sigma_2 = \text{standard deviations of assets 1 and 2} \\
-        \rho_{12} = \text{correlation between assets 1 and 2}
-        """
-    st.code(latex_variance, language="latex")
-    st.latex(latex_variance)
+    st.code(LATEX_VARIANCE, language="latex")
+    st.latex(LATEX_VARIANCE)
 
 st.write(
     "The correlation term $\\rho_{12}$ is crucial. When assets are not perfectly correlated "
@@ -68,214 +237,144 @@ st.write(
     "asset characteristics and correlations."
 )
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("**Asset 1**")
-    r1 = st.slider(
-        "Expected Return (%)",
-        min_value=0.0,
-        max_value=30.0,
-        value=8.0,
-        step=0.5,
-        key="r1",
-    )
-    sigma1 = st.slider(
-        "Volatility (%)",
-        min_value=1.0,
-        max_value=50.0,
-        value=15.0,
-        step=0.5,
-        key="sigma1",
-    )
 
-with col2:
-    st.markdown("**Asset 2**")
-    r2 = st.slider(
-        "Expected Return (%)",
-        min_value=0.0,
-        max_value=30.0,
-        value=14.0,
-        step=0.5,
-        key="r2",
-    )
-    sigma2 = st.slider(
-        "Volatility (%)",
-        min_value=1.0,
-        max_value=50.0,
-        value=25.0,
-        step=0.5,
-        key="sigma2",
-    )
-
-with col3:
-    st.markdown("**Correlation**")
-    rho = st.slider(
-        "Correlation (ρ)",
-        min_value=-1.0,
-        max_value=1.0,
-        value=0.3,
-        step=0.05,
-        key="rho",
-    )
-    st.write("")
-    st.write(
-        f"ρ = {rho:.2f}: "
-        + (
-            "Perfect positive correlation"
-            if rho == 1.0
-            else (
-                "Perfect negative correlation"
-                if rho == -1.0
-                else (
-                    "No correlation"
-                    if rho == 0.0
-                    else ("Positive correlation" if rho > 0 else "Negative correlation")
-                )
+@st.fragment
+def frontier_explorer() -> None:
+    """Render the asset inputs, frontier chart and minimum variance statistics."""
+    # Batch the inputs so the frontier updates once per submit rather than on every
+    # slider movement
+    with st.form("mpt_params"):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown("**Asset 1**")
+            r1 = st.slider(
+                "Expected Return (%)",
+                min_value=0.0,
+                max_value=30.0,
+                value=8.0,
+                step=0.5,
+                key="r1",
+            )
+            sigma1 = st.slider(
+                "Volatility (%)",
+                min_value=1.0,
+                max_value=50.0,
+                value=15.0,
+                step=0.5,
+                key="sigma1",
             )
-        )
-    )
 
-# Convert percentages to decimals
-r1_dec = r1 / 100
-r2_dec = r2 / 100
-sigma1_dec = sigma1 / 100
-sigma2_dec = sigma2 / 100
-
-# Generate portfolio combinations
-weights = np.linspace(0, 1, 100)
-portfolio_returns = []
-portfolio_risks = []
-
-for w1 in weights:
-    w2 = 1 - w1
-    # Portfolio return
-    port_return = w1 * r1_dec + w2 * r2_dec
-    # Portfolio variance
-    port_variance = (
-        (w1**2) * (sigma1_dec**2)
-        + (w2**2) * (sigma2_dec**2)
-        + 2 * w1 * w2 * sigma1_dec * sigma2_dec * rho
-    )
-    port_risk = np.sqrt(port_variance)
+        with col2:
+            st.markdown("**Asset 2**")
+            r2 = st.slider(
+                "Expected Return (%)",
+                min_value=0.0,
+                max_value=30.0,
+                value=14.0,
+                step=0.5,
+                key="r2",
+            )
+            sigma2 = st.slider(
+                "Volatility (%)",
+                min_value=1.0,
+                max_value=50.0,
+                value=25.0,
+                step=0.5,
+                key="sigma2",
+            )
 
-    portfolio_returns.append(port_return * 100)
-    portfolio_risks.append(port_risk * 100)
+        with col3:
+            st.markdown("**Correlation**")
+            rho = st.slider(
+                "Correlation (ρ)",
+                min_value=-1.0,
+                max_value=1.0,
+                value=0.3,
+                step=0.05,
+                key="rho",
+            )
+            st.write("")
+            st.write(
+                f"ρ = {rho:.2f}: "
+                + (
+                    "Perfect positive correlation"
+                    if rho == 1.0
+                    else (
+                        "Perfect negative correlation"
+                        if rho == -1.0
+                        else (
+                            "No correlation"
+                            if rho == 0.0
+                            else (
+                                "Positive correlation"
+                                if rho > 0
+                                else "Negative correlation"
+                            )
+                        )
+                    )
+                )
+            )
+        st.form_submit_button("Update")
 
-# Find minimum variance portfolio
-# Analytical solution for two assets
-if sigma1_dec != sigma2_dec or rho != 1:
-    w1_min_var = (sigma2_dec**2 - sigma1_dec * sigma2_dec * rho) / (
-        sigma1_dec**2 + sigma2_dec**2 - 2 * sigma1_dec * sigma2_dec * rho
+    # The frontier arrays are charted by build_frontier_chart, which reuses this
+    # cached call, so only the minimum variance point is needed here
+    _, _, w1_min_var, min_var_return, min_var_risk = compute_frontier(
+        r1, r2, sigma1, sigma2, rho
     )
-    w1_min_var = np.clip(w1_min_var, 0, 1)
-else:
-    w1_min_var = 0.5
-
-w2_min_var = 1 - w1_min_var
-min_var_return = (w1_min_var * r1_dec + w2_min_var * r2_dec) * 100
-min_var_risk = (
-    np.sqrt(
-        (w1_min_var**2) * (sigma1_dec**2)
-        + (w2_min_var**2) * (sigma2_dec**2)
-        + 2 * w1_min_var * w2_min_var * sigma1_dec * sigma2_dec * rho
-    )
-    * 100
-)
-
-# Create visualisation
-fig, ax = plt.subplots(figsize=(10, 6))
-
-# Plot the efficient frontier
-ax.plot(
-    portfolio_risks,
-    portfolio_returns,
-    "b-",
-    linewidth=2,
-    label="Portfolio Combinations",
-)
-
-# Mark individual assets
-ax.scatter([sigma1], [r1], color="red", s=150, zorder=5, label="Asset 1 (w₁=100%)")
-ax.scatter([sigma2], [r2], color="green", s=150, zorder=5, label="Asset 2 (w₂=100%)")
-
-# Mark minimum variance portfolio
-ax.scatter(
-    [min_var_risk],
-    [min_var_return],
-    color="orange",
-    s=200,
-    marker="*",
-    zorder=5,
-    label=f"Min Variance (w₁={w1_min_var:.0%})",
-)
-
-# Add labels
-ax.set_xlabel("Portfolio Risk (Standard Deviation) %", fontsize=12)
-ax.set_ylabel("Expected Return %", fontsize=12)
-ax.set_title("Efficient Frontier - Two Asset Portfolio", fontsize=14)
-ax.legend(loc="upper left")
-ax.grid(True, alpha=0.3)
-
-# Set axis limits with some padding
-x_min = max(0, min(portfolio_risks) - 2)
-x_max = max(portfolio_risks) + 2
-y_min = max(0, min(portfolio_returns) - 1)
-y_max = max(portfolio_returns) + 1
-ax.set_xlim(x_min, x_max)
-ax.set_ylim(y_min, y_max)
+    w2_min_var = 1 - w1_min_var
 
-plt.tight_layout()
-st.pyplot(fig)
+    st.altair_chart(build_frontier_chart(r1, r2, sigma1, sigma2, rho))
 
+    st.markdown("#### Portfolio Statistics")
 
-st.markdown("#### Portfolio Statistics")
+    col1, col2, col3 = st.columns(3)
 
-col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown("**Asset 1**")
+        st.metric("Expected Return", f"{r1:.1f}%")
+        st.metric("Volatility", f"{sigma1:.1f}%")
 
-with col1:
-    st.markdown("**Asset 1**")
-    st.metric("Expected Return", f"{r1:.1f}%")
-    st.metric("Volatility", f"{sigma1:.1f}%")
+    with col2:
+        st.markdown("**Asset 2**")
+        st.metric("Expected Return", f"{r2:.1f}%")
+        st.metric("Volatility", f"{sigma2:.1f}%")
 
-with col2:
-    st.markdown("**Asset 2**")
-    st.metric("Expected Return", f"{r2:.1f}%")
-    st.metric("Volatility", f"{sigma2:.1f}%")
+    with col3:
+        st.markdown("**Minimum Variance Portfolio**")
+        st.metric("Weight in Asset 1", f"{w1_min_var:.1%}")
+        st.metric("Expected Return", f"{min_var_return:.2f}%")
+        st.metric("Volatility", f"{min_var_risk:.2f}%")
 
-with col3:
-    st.markdown("**Minimum Variance Portfolio**")
-    st.metric("Weight in Asset 1", f"{w1_min_var:.1%}")
-    st.metric("Expected Return", f"{min_var_return:.2f}%")
-    st.metric("Volatility", f"{min_var_risk:.2f}%")
+    st.markdown("#### The Diversification Benefit")
 
+    # Calculate what the risk would be without diversification (weighted average)
+    weighted_avg_risk = w1_min_var * sigma1 + w2_min_var * sigma2
+    diversification_benefit = weighted_avg_risk - min_var_risk
 
-st.markdown("#### The Diversification Benefit")
+    st.write(
+        f"At the minimum variance portfolio, if there were no diversification benefit "
+        f"(i.e., if ρ = 1), the portfolio risk would be the weighted average: "
+        f"**{weighted_avg_risk:.2f}%**."
+    )
+    st.write(
+        f"Due to imperfect correlation (ρ = {rho:.2f}), the actual portfolio risk is "
+        f"**{min_var_risk:.2f}%**, a reduction of **{diversification_benefit:.2f}%**."
+    )
 
-# Calculate what the risk would be without diversification (weighted average)
-weighted_avg_risk = w1_min_var * sigma1 + w2_min_var * sigma2
-diversification_benefit = weighted_avg_risk - min_var_risk
+    if rho < 1:
+        st.success(
+            f"Diversification benefit: {diversification_benefit:.2f} percentage points "
+            f"of risk reduction"
+        )
+    else:
+        st.warning(
+            "With perfect correlation (ρ = 1), there is no diversification benefit. "
+            "The efficient frontier becomes a straight line between the two assets."
+        )
 
-st.write(
-    f"At the minimum variance portfolio, if there were no diversification benefit "
-    f"(i.e., if ρ = 1), the portfolio risk would be the weighted average: "
-    f"**{weighted_avg_risk:.2f}%**."
-)
-st.write(
-    f"Due to imperfect correlation (ρ = {rho:.2f}), the actual portfolio risk is "
-    f"**{min_var_risk:.2f}%**, a reduction of **{diversification_benefit:.2f}%**."
-)
 
-if rho < 1:
-    st.success(
-        f"Diversification benefit: {diversification_benefit:.2f} percentage points "
-        f"of risk reduction"
-    )
-else:
-    st.warning(
-        "With perfect correlation (ρ = 1), there is no diversification benefit. "
-        "The efficient frontier becomes a straight line between the two assets."
-    )
+frontier_explorer()
 
 
 st.markdown("#### Key Insights")
@@ -1,6 +1,11 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import altair as alt
+
+ASSET_LABELS = ("A", "B", "C")
 
 st.set_page_config(layout="wide")
 st.markdown("### Portfolio Variance and the Covariance Matrix")
@@ -95,302 +100,351 @@ st.write(
     "matrix and portfolio variance are calculated step by step."
 )
 
-st.markdown("##### Asset Parameters")
 
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("**Asset A**")
-    sigma_a = st.slider(
-        "Volatility A (%)",
-        min_value=5.0,
-        max_value=40.0,
-        value=15.0,
-        step=1.0,
-        key="sigma_a",
-    )
+# LaTeX templates for the worked example, filled with str.format on each rerun
+LATEX_WEIGHT_VECTOR = r"""
+    \mathbf{{w}} = \begin{{bmatrix}} {w[0]:.4f} \\ {w[1]:.4f} \\ {w[2]:.4f} \end{{bmatrix}}
+    \quad \text{{and}} \quad
+    \mathbf{{w}}^\top = \begin{{bmatrix}} {w[0]:.4f} & {w[1]:.4f} & {w[2]:.4f} \end{{bmatrix}}
+    """
 
-with col2:
-    st.markdown("**Asset B**")
-    sigma_b = st.slider(
-        "Volatility B (%)",
-        min_value=5.0,
-        max_value=40.0,
-        value=20.0,
-        step=1.0,
-        key="sigma_b",
-    )
+LATEX_SIGMA_W = r"""
+    \boldsymbol{{\Sigma}} \mathbf{{w}} =
+    \begin{{bmatrix}}
+    {cov[0][0]:.4f} & {cov[0][1]:.4f} & {cov[0][2]:.4f} \\
+    {cov[1][0]:.4f} & {cov[1][1]:.4f} & {cov[1][2]:.4f} \\
+    {cov[2][0]:.4f} & {cov[2][1]:.4f} & {cov[2][2]:.4f}
+    \end{{bmatrix}}
+    \begin{{bmatrix}} {w[0]:.4f} \\ {w[1]:.4f} \\ {w[2]:.4f} \end{{bmatrix}}
+    =
+    \begin{{bmatrix}} {sigma_w[0]:.6f} \\ {sigma_w[1]:.6f} \\ {sigma_w[2]:.6f} \end{{bmatrix}}
+    """
 
-with col3:
-    st.markdown("**Asset C**")
-    sigma_c = st.slider(
-        "Volatility C (%)",
-        min_value=5.0,
-        max_value=40.0,
-        value=25.0,
-        step=1.0,
-        key="sigma_c",
+LATEX_QUADRATIC_FORM = r"""
+    \sigma_p^2 = \mathbf{{w}}^\top (\boldsymbol{{\Sigma}} \mathbf{{w}}) =
+    \begin{{bmatrix}} {w[0]:.4f} & {w[1]:.4f} & {w[2]:.4f} \end{{bmatrix}}
+    \begin{{bmatrix}} {sigma_w[0]:.6f} \\ {sigma_w[1]:.6f} \\ {sigma_w[2]:.6f} \end{{bmatrix}}
+    = {variance:.6f}
+    """
+
+
+@st.cache_resource(max_entries=64)
+def build_heatmap_chart(
+    matrix, title, legend_title, scheme, label_format, reverse=False, domain=None
+) -> "alt.LayerChart":
+    """Heatmap of a matrix, given as a tuple of row tuples, with each cell labelled."""
+    import altair as alt
+    import pandas as pd
+
+    values = np.array(matrix)
+    rows, cols = np.indices(values.shape)
+    cells = pd.DataFrame(
+        {
+            "row": np.take(ASSET_LABELS, rows.ravel()),
+            "col": np.take(ASSET_LABELS, cols.ravel()),
+            "value": values.ravel(),
+        }
     )
 
-st.markdown("##### Correlations")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    rho_ab = st.slider(
-        "Correlation A-B",
-        min_value=-1.0,
-        max_value=1.0,
-        value=0.3,
-        step=0.05,
-        key="rho_ab",
-    )
+    # Fix the colour domain when given, otherwise span the matrix values
+    scale = alt.Scale(scheme=scheme, reverse=reverse)
+    if domain is not None:
+        scale = alt.Scale(scheme=scheme, reverse=reverse, domain=list(domain))
 
-with col2:
-    rho_ac = st.slider(
-        "Correlation A-C",
-        min_value=-1.0,
-        max_value=1.0,
-        value=0.1,
-        step=0.05,
-        key="rho_ac",
+    base = alt.Chart(cells).encode(
+        x=alt.X(
+            "col:O", sort=list(ASSET_LABELS), title=None, axis=alt.Axis(labelAngle=0)
+        ),
+        y=alt.Y("row:O", sort=list(ASSET_LABELS), title=None),
     )
-
-with col3:
-    rho_bc = st.slider(
-        "Correlation B-C",
-        min_value=-1.0,
-        max_value=1.0,
-        value=0.5,
-        step=0.05,
-        key="rho_bc",
+    heatmap = base.mark_rect().encode(
+        color=alt.Color(
+            "value:Q",
+            title=legend_title,
+            scale=scale,
+        )
     )
-
-st.markdown("##### Portfolio Weights")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    w_a = st.slider(
-        "Weight A (%)",
-        min_value=0.0,
-        max_value=100.0,
-        value=40.0,
-        step=5.0,
-        key="w_a",
+    labels = base.mark_text(color="black").encode(
+        text=alt.Text("value:Q", format=label_format)
     )
 
-with col2:
-    w_b = st.slider(
-        "Weight B (%)",
-        min_value=0.0,
-        max_value=100.0,
-        value=35.0,
-        step=5.0,
-        key="w_b",
+    return (heatmap + labels).properties(title=title, height=300)
+
+
+@st.cache_data(max_entries=64)
+def verification_terms(weights, covariance_matrix):
+    """Expanded-formula terms w_i w_j σ_ij over the upper triangle of Σ, and their sum."""
+    per_term = np.outer(weights, weights) * covariance_matrix
+    # Summing every entry counts each symmetric off-diagonal pair twice
+    total = per_term.sum()
+
+    upper = np.triu_indices(len(weights))
+    terms = per_term[upper]
+    terms[upper[0] != upper[1]] *= 2
+    return terms, total
+
+
+@st.fragment
+def variance_explorer() -> None:
+    """Render the inputs and every calculation that depends on them."""
+    # Batch the inputs so the calculation updates once per submit rather than on
+    # every slider movement
+    with st.form("variance_params"):
+        st.markdown("##### Asset Parameters")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown("**Asset A**")
+            sigma_a = st.slider(
+                "Volatility A (%)",
+                min_value=5.0,
+                max_value=40.0,
+                value=15.0,
+                step=1.0,
+                key="sigma_a",
+            )
+
+        with col2:
+            st.markdown("**Asset B**")
+            sigma_b = st.slider(
+                "Volatility B (%)",
+                min_value=5.0,
+                max_value=40.0,
+                value=20.0,
+                step=1.0,
+                key="sigma_b",
+            )
+
+        with col3:
+            st.markdown("**Asset C**")
+            sigma_c = st.slider(
+                "Volatility C (%)",
+                min_value=5.0,
+                max_value=40.0,
+                value=25.0,
+                step=1.0,
+                key="sigma_c",
+            )
+
+        st.markdown("##### Correlations")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            rho_ab = st.slider(
+                "Correlation A-B",
+                min_value=-1.0,
+                max_value=1.0,
+                value=0.3,
+                step=0.05,
+                key="rho_ab",
+            )
+
+        with col2:
+            rho_ac = st.slider(
+                "Correlation A-C",
+                min_value=-1.0,
+                max_value=1.0,
+                value=0.1,
+                step=0.05,
+                key="rho_ac",
+            )
+
+        with col3:
+            rho_bc = st.slider(
+                "Correlation B-C",
+                min_value=-1.0,
+                max_value=1.0,
+                value=0.5,
+                step=0.05,
+                key="rho_bc",
+            )
+
+        st.markdown("##### Portfolio Weights")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            w_a = st.slider(
+                "Weight A (%)",
+                min_value=0.0,
+                max_value=100.0,
+                value=40.0,
+                step=5.0,
+                key="w_a",
+            )
+
+        with col2:
+            w_b = st.slider(
+                "Weight B (%)",
+                min_value=0.0,
+                max_value=100.0,
+                value=35.0,
+                step=5.0,
+                key="w_b",
+            )
+
+        with col3:
+            w_c = st.slider(
+                "Weight C (%)",
+                min_value=0.0,
+                max_value=100.0,
+                value=25.0,
+                step=5.0,
+                key="w_c",
+            )
+        st.form_submit_button("Update")
+
+    # Normalise weights, falling back to equal weights when they are all zero
+    raw_weights = np.array([w_a, w_b, w_c])
+    total_weight = raw_weights.sum()
+    weights = np.divide(
+        raw_weights, total_weight, out=np.full(3, 1 / 3), where=total_weight > 0
     )
+    w_a_norm, w_b_norm, w_c_norm = weights
 
-with col3:
-    w_c = st.slider(
-        "Weight C (%)",
-        min_value=0.0,
-        max_value=100.0,
-        value=25.0,
-        step=5.0,
-        key="w_c",
-    )
+    if abs(total_weight - 100) > 0.01:
+        st.warning(
+            f"Weights sum to {total_weight:.1f}%. "
+            f"Normalised weights: A={w_a_norm:.1%}, B={w_b_norm:.1%}, C={w_c_norm:.1%}"
+        )
 
-# Normalise weights
-total_weight = w_a + w_b + w_c
-if total_weight > 0:
-    w_a_norm = w_a / total_weight
-    w_b_norm = w_b / total_weight
-    w_c_norm = w_c / total_weight
-else:
-    w_a_norm = w_b_norm = w_c_norm = 1 / 3
-
-if abs(total_weight - 100) > 0.01:
-    st.warning(
-        f"Weights sum to {total_weight:.1f}%. "
-        f"Normalised weights: A={w_a_norm:.1%}, B={w_b_norm:.1%}, C={w_c_norm:.1%}"
+    correlation_matrix = np.array(
+        [[1.0, rho_ab, rho_ac], [rho_ab, 1.0, rho_bc], [rho_ac, rho_bc, 1.0]]
     )
 
-# Convert to decimals
-sigma_a_dec = sigma_a / 100
-sigma_b_dec = sigma_b / 100
-sigma_c_dec = sigma_c / 100
-
-# Build covariance matrix
-# Cov(i,j) = rho_ij * sigma_i * sigma_j
-cov_aa = sigma_a_dec**2
-cov_bb = sigma_b_dec**2
-cov_cc = sigma_c_dec**2
-cov_ab = rho_ab * sigma_a_dec * sigma_b_dec
-cov_ac = rho_ac * sigma_a_dec * sigma_c_dec
-cov_bc = rho_bc * sigma_b_dec * sigma_c_dec
-
-covariance_matrix = np.array(
-    [[cov_aa, cov_ab, cov_ac], [cov_ab, cov_bb, cov_bc], [cov_ac, cov_bc, cov_cc]]
-)
+    # Build covariance matrix as Σ = D R D with D = diag(σ), i.e.
+    # Cov(i,j) = rho_ij * sigma_i * sigma_j
+    sigmas = np.array([sigma_a, sigma_b, sigma_c]) / 100
+    covariance_matrix = correlation_matrix * np.outer(sigmas, sigmas)
+
+    st.markdown("#### Step-by-Step Calculation")
+
+    st.markdown("##### Step 1: Construct the Covariance Matrix")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**Correlation Matrix (ρ)**")
+        st.altair_chart(
+            build_heatmap_chart(
+                tuple(map(tuple, correlation_matrix)),
+                "Correlation Matrix",
+                "Correlation",
+                "redblue",
+                ".2f",
+                reverse=True,
+                domain=(-1.0, 1.0),
+            )
+        )
+
+    with col2:
+        st.markdown("**Covariance Matrix (Σ)**")
+        # Round so the cache key is stable against float noise in the products
+        st.altair_chart(
+            build_heatmap_chart(
+                tuple(map(tuple, covariance_matrix.round(6))),
+                "Covariance Matrix",
+                "Covariance",
+                "yelloworangered",
+                ".4f",
+            )
+        )
 
-correlation_matrix = np.array(
-    [[1.0, rho_ab, rho_ac], [rho_ab, 1.0, rho_bc], [rho_ac, rho_bc, 1.0]]
-)
+    st.write(
+        "**Covariance from correlation:** $\\sigma_{ij} = \\rho_{ij} \\cdot \\sigma_i \\cdot \\sigma_j$"
+    )
 
-weights = np.array([w_a_norm, w_b_norm, w_c_norm])
-
-
-st.markdown("#### Step-by-Step Calculation")
-
-st.markdown("##### Step 1: Construct the Covariance Matrix")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("**Correlation Matrix (ρ)**")
-    fig1, ax1 = plt.subplots(figsize=(5, 4))
-    im1 = ax1.imshow(correlation_matrix, cmap="RdBu_r", vmin=-1, vmax=1)
-    ax1.set_xticks([0, 1, 2])
-    ax1.set_yticks([0, 1, 2])
-    ax1.set_xticklabels(["A", "B", "C"])
-    ax1.set_yticklabels(["A", "B", "C"])
-    for i in range(3):
-        for j in range(3):
-            ax1.text(j, i, f"{correlation_matrix[i, j]:.2f}", ha="center", va="center")
-    plt.colorbar(im1, ax=ax1, label="Correlation")
-    ax1.set_title("Correlation Matrix")
-    st.pyplot(fig1)
-
-with col2:
-    st.markdown("**Covariance Matrix (Σ)**")
-    fig2, ax2 = plt.subplots(figsize=(5, 4))
-    im2 = ax2.imshow(covariance_matrix, cmap="YlOrRd")
-    ax2.set_xticks([0, 1, 2])
-    ax2.set_yticks([0, 1, 2])
-    ax2.set_xticklabels(["A", "B", "C"])
-    ax2.set_yticklabels(["A", "B", "C"])
-    for i in range(3):
-        for j in range(3):
-            ax2.text(j, i, f"{covariance_matrix[i, j]:.4f}", ha="center", va="center")
-    plt.colorbar(im2, ax=ax2, label="Covariance")
-    ax2.set_title("Covariance Matrix")
-    st.pyplot(fig2)
+    st.markdown("##### Step 2: Define the Weight Vector")
 
-st.write(
-    "**Covariance from correlation:** $\\sigma_{ij} = \\rho_{ij} \\cdot \\sigma_i \\cdot \\sigma_j$"
-)
+    st.latex(LATEX_WEIGHT_VECTOR.format(w=weights))
 
+    st.markdown("##### Step 3: Compute Σw (Matrix-Vector Multiplication)")
 
-st.markdown("##### Step 2: Define the Weight Vector")
+    sigma_w = covariance_matrix @ weights
 
-st.latex(rf"""
-    \mathbf{{w}} = \begin{{bmatrix}} {w_a_norm:.4f} \\ {w_b_norm:.4f} \\ {w_c_norm:.4f} \end{{bmatrix}}
-    \quad \text{{and}} \quad
-    \mathbf{{w}}^\top = \begin{{bmatrix}} {w_a_norm:.4f} & {w_b_norm:.4f} & {w_c_norm:.4f} \end{{bmatrix}}
-    """)
+    st.write("First, multiply the covariance matrix by the weight vector:")
 
+    st.latex(LATEX_SIGMA_W.format(cov=covariance_matrix, w=weights, sigma_w=sigma_w))
 
-st.markdown("##### Step 3: Compute Σw (Matrix-Vector Multiplication)")
+    st.markdown("##### Step 4: Compute wᵀΣw (Final Dot Product)")
 
-sigma_w = covariance_matrix @ weights
+    portfolio_variance = weights @ sigma_w
+    portfolio_volatility = np.sqrt(portfolio_variance) * 100
 
-st.write("First, multiply the covariance matrix by the weight vector:")
+    st.write("Finally, take the dot product with the weight vector:")
 
-st.latex(rf"""
-    \boldsymbol{{\Sigma}} \mathbf{{w}} =
-    \begin{{bmatrix}}
-    {cov_aa:.4f} & {cov_ab:.4f} & {cov_ac:.4f} \\
-    {cov_ab:.4f} & {cov_bb:.4f} & {cov_bc:.4f} \\
-    {cov_ac:.4f} & {cov_bc:.4f} & {cov_cc:.4f}
-    \end{{bmatrix}}
-    \begin{{bmatrix}} {w_a_norm:.4f} \\ {w_b_norm:.4f} \\ {w_c_norm:.4f} \end{{bmatrix}}
-    =
-    \begin{{bmatrix}} {sigma_w[0]:.6f} \\ {sigma_w[1]:.6f} \\ {sigma_w[2]:.6f} \end{{bmatrix}}
-    """)
-
-
-st.markdown("##### Step 4: Compute wᵀΣw (Final Dot Product)")
-
-portfolio_variance = weights @ sigma_w
-portfolio_volatility = np.sqrt(portfolio_variance) * 100
-
-st.write("Finally, take the dot product with the weight vector:")
+    st.latex(
+        LATEX_QUADRATIC_FORM.format(
+            w=weights, sigma_w=sigma_w, variance=portfolio_variance
+        )
+    )
 
-st.latex(rf"""
-    \sigma_p^2 = \mathbf{{w}}^\top (\boldsymbol{{\Sigma}} \mathbf{{w}}) =
-    \begin{{bmatrix}} {w_a_norm:.4f} & {w_b_norm:.4f} & {w_c_norm:.4f} \end{{bmatrix}}
-    \begin{{bmatrix}} {sigma_w[0]:.6f} \\ {sigma_w[1]:.6f} \\ {sigma_w[2]:.6f} \end{{bmatrix}}
-    = {portfolio_variance:.6f}
-    """)
+    st.latex(
+        rf"\sigma_p = \sqrt{{{portfolio_variance:.6f}}} = {portfolio_volatility:.2f}\%"
+    )
 
-st.latex(
-    rf"\sigma_p = \sqrt{{{portfolio_variance:.6f}}} = {portfolio_volatility:.2f}\%"
-)
+    st.markdown("#### Results Summary")
 
+    col1, col2, col3 = st.columns(3)
 
-st.markdown("#### Results Summary")
+    with col1:
+        st.metric("Portfolio Variance", f"{portfolio_variance:.6f}")
 
-col1, col2, col3 = st.columns(3)
+    with col2:
+        st.metric("Portfolio Volatility", f"{portfolio_volatility:.2f}%")
 
-with col1:
-    st.metric("Portfolio Variance", f"{portfolio_variance:.6f}")
+    with col3:
+        # Calculate weighted average volatility (no diversification)
+        weighted_avg_vol = w_a_norm * sigma_a + w_b_norm * sigma_b + w_c_norm * sigma_c
+        diversification_benefit = weighted_avg_vol - portfolio_volatility
+        st.metric(
+            "Diversification Benefit",
+            f"{diversification_benefit:.2f}%",
+            help="Reduction in volatility compared to weighted average of individual volatilities",
+        )
 
-with col2:
-    st.metric("Portfolio Volatility", f"{portfolio_volatility:.2f}%")
+    st.markdown("#### Verification: Expanded Formula")
 
-with col3:
-    # Calculate weighted average volatility (no diversification)
-    weighted_avg_vol = w_a_norm * sigma_a + w_b_norm * sigma_b + w_c_norm * sigma_c
-    diversification_benefit = weighted_avg_vol - portfolio_volatility
-    st.metric(
-        "Diversification Benefit",
-        f"{diversification_benefit:.2f}%",
-        help="Reduction in volatility compared to weighted average of individual volatilities",
+    st.write(
+        "We can verify our matrix calculation by expanding the summation manually:"
     )
 
-
-st.markdown("#### Verification: Expanded Formula")
-
-st.write("We can verify our matrix calculation by expanding the summation manually:")
-
-# Calculate each term
-term_aa = (w_a_norm**2) * cov_aa
-term_bb = (w_b_norm**2) * cov_bb
-term_cc = (w_c_norm**2) * cov_cc
-term_ab = 2 * w_a_norm * w_b_norm * cov_ab
-term_ac = 2 * w_a_norm * w_c_norm * cov_ac
-term_bc = 2 * w_b_norm * w_c_norm * cov_bc
-
-verification_total = term_aa + term_bb + term_cc + term_ab + term_ac + term_bc
-
-st.latex(r"""
+    st.latex(r"""
     \sigma_p^2 = w_A^2 \sigma_A^2 + w_B^2 \sigma_B^2 + w_C^2 \sigma_C^2
     + 2 w_A w_B \sigma_{AB} + 2 w_A w_C \sigma_{AC} + 2 w_B w_C \sigma_{BC}
     """)
 
-with st.expander("Show detailed calculation", expanded=False):
-    st.write(
-        f"$w_A^2 \\sigma_A^2 = {w_a_norm:.4f}^2 \\times {cov_aa:.4f} = {term_aa:.6f}$"
-    )
-    st.write(
-        f"$w_B^2 \\sigma_B^2 = {w_b_norm:.4f}^2 \\times {cov_bb:.4f} = {term_bb:.6f}$"
-    )
-    st.write(
-        f"$w_C^2 \\sigma_C^2 = {w_c_norm:.4f}^2 \\times {cov_cc:.4f} = {term_cc:.6f}$"
-    )
-    st.write(
-        f"$2 w_A w_B \\sigma_{{AB}} = 2 \\times {w_a_norm:.4f} \\times {w_b_norm:.4f} "
-        f"\\times {cov_ab:.4f} = {term_ab:.6f}$"
-    )
-    st.write(
-        f"$2 w_A w_C \\sigma_{{AC}} = 2 \\times {w_a_norm:.4f} \\times {w_c_norm:.4f} "
-        f"\\times {cov_ac:.4f} = {term_ac:.6f}$"
-    )
-    st.write(
-        f"$2 w_B w_C \\sigma_{{BC}} = 2 \\times {w_b_norm:.4f} \\times {w_c_norm:.4f} "
-        f"\\times {cov_bc:.4f} = {term_bc:.6f}$"
-    )
-    st.write(f"**Total: {verification_total:.6f}** ✓")
+    with st.expander("Show detailed calculation", expanded=False):
+        terms, verification_total = verification_terms(weights, covariance_matrix)
+        term_aa, term_ab, term_ac, term_bb, term_bc, term_cc = terms
+
+        st.write(
+            f"$w_A^2 \\sigma_A^2 = {w_a_norm:.4f}^2 \\times {covariance_matrix[0, 0]:.4f} = {term_aa:.6f}$"
+        )
+        st.write(
+            f"$w_B^2 \\sigma_B^2 = {w_b_norm:.4f}^2 \\times {covariance_matrix[1, 1]:.4f} = {term_bb:.6f}$"
+        )
+        st.write(
+            f"$w_C^2 \\sigma_C^2 = {w_c_norm:.4f}^2 \\times {covariance_matrix[2, 2]:.4f} = {term_cc:.6f}$"
+        )
+        st.write(
+            f"$2 w_A w_B \\sigma_{{AB}} = 2 \\times {w_a_norm:.4f} \\times {w_b_norm:.4f} "
+            f"\\times {covariance_matrix[0, 1]:.4f} = {term_ab:.6f}$"
+        )
+        st.write(
+            f"$2 w_A w_C \\sigma_{{AC}} = 2 \\times {w_a_norm:.4f} \\times {w_c_norm:.4f} "
+            f"\\times {covariance_matrix[0, 2]:.4f} = {term_ac:.6f}$"
+        )
+        st.write(
+            f"$2 w_B w_C \\sigma_{{BC}} = 2 \\times {w_b_norm:.4f} \\times {w_c_norm:.4f} "
+            f"\\times {covariance_matrix[1, 2]:.4f} = {term_bc:.6f}$"
+        )
+        st.write(f"**Total: {verification_total:.6f}** ✓")
+
+
+variance_explorer()
 
 
 st.markdown("#### Key Insights")
@@ -0,0 +1,109 @@
+import streamlit as st
+
+# Page content for each Greek: the explanation before the formula, the formula
+# LaTeX (if any) and the markdown blocks that follow it
+GREEKS = {
+    "delta": {
+        "title": "Delta",
+        "intro": "The delta of an option, is the ratio of the change in the price of the call option, c, to the change in the price of the underlying asset, s, for small changes in s.  I.e. the sensitivity of the option price to changes in the underlying stock price.",
+        "latex": r"""
+    delta = \Delta = \frac{\delta c}{\delta s} \\ \\
+
+    where: \\
+    \delta c = \text change~in~the~call~price \\
+    \delta s = \text change~in~the~underlying~asset~price \\
+    """,
+        "body": [
+            "#### Option Delta",
+            (
+                "A call delta equal to 0.7 means that the price of a call option on a stock will change by approximately £0.70 for a £1.00 change in the value of the stock.  To completely hedge a long stock or short call position, an investor must purchase the number of shares of stock equal to delta times the number of options sold.\n\n"
+                "**Delta-neutral** means that the position is completely hedged.\n\n"
+                r"E.g., if an investor is short 1,000 call options, they will need to be long 700 ($0.7 \cdot 1000$) shares of the underlying."
+                "\n\n"
+                "The delta changes as the stock  price and time change, therefore in order to maintain a **delta-neutral** position the number of assets held must be continually adjusted buy by buying and selling the stock.  This is known as **hedging** or **rebalancing** of the portfolio.  Also known as **dynamic hedging**. "
+            ),
+        ],
+    },
+    "gamma": {
+        "title": "Gamma",
+        "intro": r"Gamma, $$\Gamma$$, is the rate of change of delta of an option.  It measures the curvature of the option price function that is not captured by delta.  It is the second derivative of the option price with respect to the underlying asset price.  I.e. the sensitivity of the delta to the underlying stock price."
+        "\n\n"
+        "Gamma is always positive for long options and negative for short options.\n\n"
+        "Gamma is highest for at-the-money options and decreases as the option moves further in or out of the money.\n\n"
+        "It can be thouht of as a measure of how often a position needs to be rebalanced in order to maintain a delta-neutral position .",
+        "latex": r"""
+    gamma = \Gamma = \frac{\delta^2 c}{\delta s^2} \\ \\
+
+    where: \\
+    \delta^2 c = \text change~in~the~call~price \\
+    \delta s^2 = \text change~in~the~underlying~asset~price \\
+    """,
+        "body": [
+            (
+                "**Delta-neutral** positions can hedge the portfolio against small changes in the underlying asset price.\n\n"
+                "**Gamma-neutral** positions can hedge the portfolio against large changes in the underlying asset price.  This can be done by buying or selling options to offset the delta of the portfolio.  This is known as **gamma hedging**."
+            ),
+        ],
+    },
+    "theta": {
+        "title": "Theta",
+        "intro": r"Theta, $\Theta$, is the option's sensitivity to a decrease in time to expiration.  It is also known as 'time decay' and is a function of both time and the price of the underlying asset.",
+        "latex": r"""
+        theta = \Theta = \frac{\delta c}{\delta t} \\ \\
+
+        where: \\
+        \delta c = \text change~in~the~call~price \\
+        \delta t = \text change~in~time \\
+        """,
+        "body": [
+            "Theta is negative for long options and positive for short options.",
+            "Theta is highest for at-the-money options and decreases as the option moves further in or out of the money.",
+            "Theta is related to value of the option, the delta and the gamma by the Black-Scholes formula.",
+        ],
+    },
+    "vega": {
+        "title": "Vega",
+        "intro": "Vega measures the sensitivity of the option's price to changes in the volatility of the underlying asset.",
+        "latex": None,
+        "body": [
+            "A Vega of 7 means that a 1% increase in volatility will increase the price of the option by 0.07.",
+            "For a given maturity, exercise price and risk-free rate, the Vega of a call option is equal to the Vega of a put option.",
+            (
+                "Vega is positive for long options and negative for short options as it increases the value of both option types.  "
+                "Vega is highest for at-the-money options and decreases as the option moves further in or out of the money."
+            ),
+        ],
+    },
+    "rho": {
+        "title": "Rho",
+        "intro": None,
+        "latex": None,
+        "body": [],
+    },
+}
+
+
+def render_greek(name: str) -> None:
+    """Render the Greeks page for name, one of the keys of GREEKS."""
+    greek = GREEKS[name]
+
+    # Page config is sticky for the session, so only send it on the first run
+    if f"_page_config_greeks_{name}" not in st.session_state:
+        st.set_page_config(layout="wide")
+        st.session_state[f"_page_config_greeks_{name}"] = True
+    st.markdown(f"### The Greeks - {greek['title']}")
+
+    st.markdown(f"#### {greek['title']}")
+
+    if greek["intro"]:
+        st.markdown(greek["intro"])
+
+    if greek["latex"]:
+        with st.expander(label=greek["title"], expanded=True):
+            st.latex(greek["latex"])
+
+        with st.expander(label="LaTeX source", expanded=False):
+            st.code(greek["latex"], language="latex")
+
+    for block in greek["body"]:
+        st.markdown(block)
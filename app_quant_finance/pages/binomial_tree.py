@@ -1,97 +1,145 @@
+import io
 import streamlit as st
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
 
 st.set_page_config(layout="wide")
 st.markdown("### The Binomial Tree")
 
 
-def binomial_tree(n: int, p: float) -> nx.DiGraph:
+@st.cache_data(max_entries=64)
+def build_tree_arrays(
+    n: int, p: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
-    Generates a NetworkX binomial tree.
+    Builds the binomial tree as NumPy arrays.
 
-    Each node represents a state (level, successes).
-    Each edge represents a transition with a probability.
-    The tree is built level by level, where each node has two children:
-    one for success and one for failure.
-    The root node is (0, 0), representing the initial state with 0 successes.
-    The tree is built until level n, where n is the number of trials.
-    The probability of success is p, and the probability of failure is 1 - p.
-    The function returns a directed graph (DiGraph) representing the binomial tree.
+    Nodes are the (level, successes) pairs with successes <= level, ordered level by
+    level, so node (level, successes) has index level * (level + 1) / 2 + successes.
+    Each node below level n has a success edge to (level + 1, successes + 1) and a
+    failure edge to (level + 1, successes).
 
     Parameters:
     n (int): Number of trials.
     p (float): Probability of success.
 
     Returns:
-    G (networkx.DiGraph): Directed graph representing the binomial tree.
+    nodes (np.ndarray): (level, successes) of each node, shape (num_nodes, 2).
+    edge_src (np.ndarray): Index of the parent node of each edge.
+    edge_dst (np.ndarray): Index of the child node of each edge.
+    edge_prob (np.ndarray): Transition probability of each edge.
     """
-    G = nx.DiGraph()
-    nodes = [(0, 0)]  # (level, successes)
-    G.add_node((0, 0))
+    levels, successes = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    mask = successes <= levels
+    nodes = np.stack([levels[mask], successes[mask]], axis=-1)
+
+    # Every node above the last level is a parent of two children on the next level
+    parents = nodes[: n * (n + 1) // 2]
+    next_level = parents[:, 0] + 1
+    failure_dst = next_level * (next_level + 1) // 2 + parents[:, 1]
+    edge_src = np.repeat(np.arange(len(parents)), 2)
+    edge_dst = np.stack([failure_dst + 1, failure_dst], axis=-1).ravel()
+    edge_prob = np.tile([p, 1 - p], len(parents))
+
+    return nodes, edge_src, edge_dst, edge_prob
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def binomial_tree_png(n: int, p: float) -> bytes:
+    """Binomial tree chart as PNG bytes, cached so repeated (n, p) skip re-rendering."""
+    from matplotlib.figure import Figure
+
+    nodes, edge_src, edge_dst, edge_prob = build_tree_arrays(n, p)
+    # Centre each level vertically for better visualisation
+    pos = np.stack([nodes[:, 0], nodes[:, 1] - nodes[:, 0] / 2], axis=-1)
+
+    # Create the figure outside the pyplot registry so it is freed once rendered
+    fig = Figure()
+    ax = fig.subplots()
+    ax.axis("off")
+    ax.margins(0.1)
+
+    # Draw each transition as an arrow, labelled with its probability and rotated
+    # to follow the edge. The label sits 30% of the way from the parent node, where
+    # nx.draw_networkx_edge_labels(label_pos=0.3) placed it when drawing along the
+    # arrow path (e.g. at (0.308, 0.154) on the (0, 0) -> (1, 1) edge)
+    src, dst = pos[edge_src], pos[edge_dst]
+    delta = dst - src
+    label_xy = src + 0.3 * delta
+    angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+    for start, end, (x, y), angle, prob in zip(src, dst, label_xy, angles, edge_prob):
+        ax.annotate(
+            "",
+            xy=end,
+            xytext=start,
+            arrowprops={
+                "arrowstyle": "-|>",
+                "color": "black",
+                "shrinkA": 15,
+                "shrinkB": 15,
+            },
+            zorder=1,
+        )
+        ax.text(
+            x,
+            y,
+            f"{prob:.2f}",
+            fontsize=8,
+            ha="center",
+            va="center",
+            rotation=angle,
+            rotation_mode="anchor",
+            transform_rotates_text=True,
+            bbox={"boxstyle": "round", "ec": "white", "fc": "white"},
+            zorder=1,
+        )
+
+    ax.scatter(pos[:, 0], pos[:, 1], s=800, color="lightblue", zorder=2)
+    for (level, successes), (x, y) in zip(nodes.tolist(), pos):
+        ax.text(
+            x,
+            y,
+            f"({level}, {successes})",
+            fontsize=8,
+            fontweight="bold",
+            ha="center",
+            va="center",
+            zorder=3,
+        )
 
-    while nodes:
-        level, successes = nodes.pop(0)
-        if level < n:
-            # Probability of success
-            next_success = (level + 1, successes + 1)
-            G.add_edge((level, successes), next_success, probability=p)
-            nodes.append(next_success)
-
-            # Probability of failure
-            next_failure = (level + 1, successes)
-            G.add_edge((level, successes), next_failure, probability=1 - p)
-            nodes.append(next_failure)
+    ax.set_title(f"Binomial Tree (n={n}, p={p})")
+    ax.set_xlabel("Level")
+    ax.set_ylabel("Number of Successes")
 
-    return G
+    buffer = io.BytesIO()
+    # Match the st.pyplot defaults so the chart looks the same as before
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    return buffer.getvalue()
 
 
 def display_binomial_tree(n: int, p: float) -> None:
     """Generates and displays the binomial tree using Matplotlib in Streamlit."""
-
-    G = binomial_tree(n, p)
-    st.write(G)
-    pos = {}
-    for node in G.nodes():
-        level, successes = node
-        pos[node] = (
-            level,
-            successes - level / 2,
-        )  # Adjust y-position for better visualization
-
-    edge_labels = nx.get_edge_attributes(G, "probability")
-    formatted_edge_labels = {k: f"{v:.2f}" for k, v in edge_labels.items()}
-
-    fig, ax = plt.subplots()
-    nx.draw(
-        G,
-        pos,
-        with_labels=True,
-        node_size=800,
-        node_color="lightblue",
-        font_size=8,
-        font_weight="bold",
-        ax=ax,
-    )
-    nx.draw_networkx_edge_labels(
-        G, pos, edge_labels=formatted_edge_labels, font_size=8, label_pos=0.3, ax=ax
+    num_nodes = (n + 1) * (n + 2) // 2
+    st.write(f"`Binomial tree with {num_nodes} nodes and {n * (n + 1)} edges`")
+    # Round so slider steps that differ only by float noise share a cache entry
+    st.image(binomial_tree_png(n, round(p, 4)), width="stretch")
+
+
+@st.fragment
+def tree_explorer() -> None:
+    """Render the sliders and the tree, rerunning only this block."""
+    n = st.slider("Number of Trials (n)", min_value=1, max_value=5, value=2)
+    p = st.slider(
+        "Probability of Success (p)", min_value=0.0, max_value=1.0, value=0.3, step=0.05
     )
-    ax.set_title(f"Binomial Tree (n={n}, p={p})")
-    ax.set_xlabel("Level")
-    ax.set_ylabel("Number of Successes")
-    st.pyplot(fig)
-
 
-n = st.slider("Number of Trials (n)", min_value=1, max_value=5, value=2)
-p = st.slider(
-    "Probability of Success (p)", min_value=0.0, max_value=1.0, value=0.3, step=0.05
-)
-
-st.info("""
+    st.info("""
 Each node is labeled (i, j) where:
 - i = time step
 - j = number of upward moves
 - Nodes are arranged to show time progressing on the x-axis and states on the y-axis.
 - Two edges per node: one for an up move and one for a down move.
         """)
-display_binomial_tree(n, p)
+    display_binomial_tree(n, p)
+
+
+tree_explorer()
@@ -1,7 +1,3 @@
-import streamlit as st
+from _greeks_common import render_greek
 
-st.set_page_config(layout="wide")
-st.markdown("### The Greeks - Rho")
-
-
-st.markdown("#### Rho")
+render_greek("rho")